@@ -17,8 +17,8 @@ class SwarmPerformance:
 
 
 def compute_hit_rate(predictions: Iterable[float], outcomes: Iterable[float]) -> float:
-    preds = np.array(list(predictions))
-    outs = np.array(list(outcomes))
+    preds = np.fromiter(predictions, dtype=np.float64)
+    outs = np.fromiter(outcomes, dtype=np.float64)
     if preds.size == 0 or outs.size == 0:
         return 0.0
     agreement = np.sign(preds) == np.sign(outs)
@@ -30,11 +30,20 @@ def evaluate_swarm(snapshots: List[SwarmSnapshot], realized_returns: List[float]
     if not snapshots or not realized_returns:
         return performances
 
-    # Align by index for simplicity.
-    for horizon in snapshots[-1].per_horizon.keys():
-        preds = [snap.per_horizon.get(horizon, {}).get("swarm_score", 0.0) for snap in snapshots]
-        hit_rate = compute_hit_rate(preds, realized_returns[: len(preds)])
-        average_payoff = float(np.mean(np.array(preds) * np.array(realized_returns[: len(preds)])))
+    horizons = list(snapshots[-1].per_horizon.keys())
+    if not horizons:
+        return performances
+
+    # Align by index for simplicity: one row of predictions per horizon.
+    returns = np.asarray(realized_returns[: len(snapshots)], dtype=np.float64)
+    aligned = snapshots[: returns.size]
+    preds = np.array(
+        [[snap.per_horizon.get(horizon, {}).get("swarm_score", 0.0) for snap in aligned] for horizon in horizons],
+        dtype=np.float64,
+    )
+    hit_rates = (np.sign(preds) == np.sign(returns)).mean(axis=1)
+    payoffs = (preds * returns).mean(axis=1)
+    for horizon, hit_rate, average_payoff in zip(horizons, hit_rates.tolist(), payoffs.tolist()):
         performances.append(SwarmPerformance(hit_rate=hit_rate, average_payoff=average_payoff, horizon=horizon))
     return performances
 
@@ -1,150 +1,374 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlencode
 
 import httpx
+import orjson
+import numpy as np
+from cachetools import TTLCache
 
 from core.config import get_settings
-from core.utils import retry
+from core.http import build_async_session, get_session
+from core.utils import pid_cache, retry
 
 logger = logging.getLogger(__name__)
 
 BINANCE_API_BASE = "https://api.binance.com"
 BINANCE_FAPI_BASE = "https://fapi.binance.com"
+AGG_TRADES_URL = f"{BINANCE_API_BASE}/api/v3/aggTrades"
+KLINES_URL = f"{BINANCE_API_BASE}/api/v3/klines"
+OPEN_INTEREST_URL = f"{BINANCE_FAPI_BASE}/futures/data/openInterestHist"
+FUNDING_RATE_URL = f"{BINANCE_FAPI_BASE}/fapi/v1/fundingRate"
+LONG_SHORT_URL = f"{BINANCE_FAPI_BASE}/futures/data/globalLongShortAccountRatio"
+
+
+@lru_cache(maxsize=32)
+def _make_url(endpoint: str, **params: Any) -> str:
+    # Query strings are static per symbol/interval/limit, so each one is encoded once.
+    return f"{endpoint}?{urlencode(params)}"
+
+
+@dataclass
+class TradeBatch:
+    """Columnar aggregate trades; timestamps stay as epoch milliseconds."""
+
+    price: np.ndarray
+    quantity: np.ndarray
+    ts_ms: np.ndarray
+    is_buyer_maker: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.price.size)
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.ts_ms.astype("datetime64[ms]")
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "price": price,
+                "quantity": quantity,
+                "timestamp": timestamp,
+                "is_buyer_maker": maker,
+            }
+            for price, quantity, timestamp, maker in zip(
+                self.price.tolist(),
+                self.quantity.tolist(),
+                self.ts.tolist(),
+                self.is_buyer_maker.tolist(),
+            )
+        ]
+
+
+@dataclass
+class KlineBatch:
+    """Columnar candles parsed straight from Binance's rectangular kline rows."""
+
+    open_time_ms: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.close.size)
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.open_time_ms.astype("datetime64[ms]")
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "open_time": open_time,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+            }
+            for open_time, open_, high, low, close, volume in zip(
+                self.ts.tolist(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+            )
+        ]
+
+
+@dataclass
+class RateSeries:
+    """Timestamped scalar series such as funding rates or long/short ratios."""
+
+    ts_ms: np.ndarray
+    value: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.value.size)
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.ts_ms.astype("datetime64[ms]")
 
 
 class BinanceClient:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.session = httpx.Client(timeout=10.0)
+        self.session = get_session()
+        # The pooled session is shared with other clients, so the API key stays per-request.
+        self._headers = {"X-MBX-APIKEY": self.settings.binance_api_key} if self.settings.binance_api_key else {}
+        # Derivatives endpoints refresh every 5m-8h; only successful responses are cached.
+        self._oi_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+        self._funding_cache: TTLCache = TTLCache(maxsize=64, ttl=3600)
+        self._lsr_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+        # Endpoints that exhausted their retries serve fallbacks until the entry expires.
+        self._breaker: TTLCache = TTLCache(maxsize=32, ttl=30)
+        # The client is shared across worker threads and TTLCache is not thread-safe (lookups and
+        # inserts expire and relink entries), so every cache and breaker access holds this lock.
+        self._cache_lock = threading.Lock()
+
+    def _tripped(self, url: str) -> bool:
+        with self._cache_lock:
+            return url in self._breaker
+
+    def _trip(self, url: str) -> None:
+        with self._cache_lock:
+            self._breaker[url] = True
+
+    def _cache_lookup(self, cache: TTLCache, key: tuple) -> Any:
+        with self._cache_lock:
+            return cache.get(key)
+
+    def _cache_store(self, cache: TTLCache, key: tuple, value: Any) -> None:
+        with self._cache_lock:
+            cache[key] = value
 
     @retry()
-    def _get(self, url: str, params: dict | None = None) -> Any:
-        headers = {}
-        if self.settings.binance_api_key:
-            headers["X-MBX-APIKEY"] = self.settings.binance_api_key
+    def _request(self, url: str) -> Any:
+        response = self.session.get(url, headers=self._headers)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    def _get(self, url: str) -> Any:
+        if self._tripped(url):
+            return None
+        try:
+            return self._request(url)
+        except Exception as exc:
+            logger.warning("Binance request failed: %s", exc)
+            self._trip(url)
+            return None
+
+    def _cached_get(self, cache: TTLCache, key: tuple, url: str, parse: Callable[[Any], Any]) -> Any:
+        cached = self._cache_lookup(cache, key)
+        if cached is not None:
+            return cached
+        data = self._get(url)
+        result = parse(data)
+        if data:
+            self._cache_store(cache, key, result)
+        return result
+
+    async def _aget(self, session: httpx.AsyncClient, url: str) -> Any:
+        if self._tripped(url):
+            return None
         try:
-            response = self.session.get(url, params=params, headers=headers)
+            response = await session.get(url, headers=self._headers)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as exc:
             logger.warning("Binance request failed: %s", exc)
+            self._trip(url)
             return None
 
-    def fetch_agg_trades(self, symbol: str = "XRPUSDT", limit: int = 200) -> List[Dict[str, Any]]:
-        data = self._get(f"{BINANCE_API_BASE}/api/v3/aggTrades", params={"symbol": symbol, "limit": limit})
+    async def _acached_get(
+        self, session: httpx.AsyncClient, cache: TTLCache, key: tuple, url: str, parse: Callable[[Any], Any]
+    ) -> Any:
+        cached = self._cache_lookup(cache, key)
+        if cached is not None:
+            return cached
+        data = await self._aget(session, url)
+        result = parse(data)
+        if data:
+            self._cache_store(cache, key, result)
+        return result
+
+    async def fetch_all_async(
+        self, session: httpx.AsyncClient | None = None, symbol: str = "XRPUSDT"
+    ) -> Dict[str, Any]:
+        """Fetch every market endpoint concurrently so the tick pays one round-trip, not five.
+
+        Async clients are bound to one event loop, so the caller owns ``session``; the client itself
+        is a process-wide singleton shared across worker threads.
+        """
+        if session is None:
+            async with build_async_session() as owned:
+                return await self.fetch_all_async(owned, symbol)
+        trades, klines, open_interest, funding, long_short = await asyncio.gather(
+            self._aget(session, _make_url(AGG_TRADES_URL, symbol=symbol, limit=200)),
+            self._aget(session, _make_url(KLINES_URL, symbol=symbol, interval="1h", limit=200)),
+            self._acached_get(
+                session,
+                self._oi_cache,
+                (symbol,),
+                _make_url(OPEN_INTEREST_URL, symbol=symbol, period="5m", limit=30),
+                lambda data: self._parse_open_interest(data, symbol),
+            ),
+            self._acached_get(
+                session,
+                self._funding_cache,
+                (symbol,),
+                _make_url(FUNDING_RATE_URL, symbol=symbol, limit=100),
+                self._parse_funding_rates,
+            ),
+            self._acached_get(
+                session,
+                self._lsr_cache,
+                (symbol, "5m"),
+                _make_url(LONG_SHORT_URL, symbol=symbol, period="5m", limit=50),
+                self._parse_long_short_ratio,
+            ),
+        )
+        return {
+            "agg_trades": self._parse_agg_trades(trades, 200),
+            "klines": self._parse_klines(klines, 200),
+            "open_interest": open_interest,
+            "funding_rates": funding,
+            "long_short_ratio": long_short,
+        }
+
+    def fetch_all(self, symbol: str = "XRPUSDT") -> Dict[str, Any]:
+        return asyncio.run(self.fetch_all_async(symbol=symbol))
+
+    def fetch_agg_trades(self, symbol: str = "XRPUSDT", limit: int = 200) -> TradeBatch:
+        data = self._get(_make_url(AGG_TRADES_URL, symbol=symbol, limit=limit))
+        return self._parse_agg_trades(data, limit)
+
+    def _parse_agg_trades(self, data: Any, limit: int) -> TradeBatch:
         if not data:
             return self._fallback_trades(limit)
-        trades: List[Dict[str, Any]] = []
-        for item in data:
-            trades.append(
-                {
-                    "price": float(item.get("p", 0)),
-                    "quantity": float(item.get("q", 0)),
-                    "timestamp": datetime.fromtimestamp(item.get("T", 0) / 1000),
-                    "is_buyer_maker": bool(item.get("m", False)),
-                }
-            )
-        return trades
-
-    def fetch_klines(self, symbol: str = "XRPUSDT", interval: str = "1h", limit: int = 200) -> List[Dict[str, Any]]:
-        data = self._get(
-            f"{BINANCE_API_BASE}/api/v3/klines",
-            params={"symbol": symbol, "interval": interval, "limit": limit},
+        count = len(data)
+        return TradeBatch(
+            price=np.fromiter((float(item.get("p", 0)) for item in data), dtype=np.float64, count=count),
+            quantity=np.fromiter((float(item.get("q", 0)) for item in data), dtype=np.float64, count=count),
+            ts_ms=np.fromiter((item.get("T", 0) for item in data), dtype=np.int64, count=count),
+            is_buyer_maker=np.fromiter((bool(item.get("m", False)) for item in data), dtype=bool, count=count),
         )
+
+    def fetch_klines(self, symbol: str = "XRPUSDT", interval: str = "1h", limit: int = 200) -> KlineBatch:
+        data = self._get(_make_url(KLINES_URL, symbol=symbol, interval=interval, limit=limit))
+        return self._parse_klines(data, limit)
+
+    def _parse_klines(self, data: Any, limit: int) -> KlineBatch:
         if not data:
             return self._fallback_klines(limit)
-        candles: List[Dict[str, Any]] = []
-        for kline in data:
-            candles.append(
-                {
-                    "open_time": datetime.fromtimestamp(kline[0] / 1000),
-                    "open": float(kline[1]),
-                    "high": float(kline[2]),
-                    "low": float(kline[3]),
-                    "close": float(kline[4]),
-                    "volume": float(kline[5]),
-                }
-            )
-        return candles
+        # Rows are rectangular numeric strings; trim to the used columns and let one cast parse them.
+        matrix = np.asarray([row[:6] for row in data], dtype=np.float64)
+        return KlineBatch(
+            open_time_ms=matrix[:, 0].astype(np.int64),
+            open=matrix[:, 1],
+            high=matrix[:, 2],
+            low=matrix[:, 3],
+            close=matrix[:, 4],
+            volume=matrix[:, 5],
+        )
 
     def fetch_futures_open_interest(self, symbol: str = "XRPUSDT") -> Dict[str, Any]:
-        data = self._get(f"{BINANCE_FAPI_BASE}/futures/data/openInterestHist", params={"symbol": symbol, "period": "5m", "limit": 30})
+        return self._cached_get(
+            self._oi_cache,
+            (symbol,),
+            _make_url(OPEN_INTEREST_URL, symbol=symbol, period="5m", limit=30),
+            lambda data: self._parse_open_interest(data, symbol),
+        )
+
+    def _parse_open_interest(self, data: Any, symbol: str) -> Dict[str, Any]:
         if not data:
             return {"symbol": symbol, "openInterest": 1000000, "timestamp": datetime.utcnow()}
         latest = data[-1]
         return {
             "symbol": symbol,
             "openInterest": float(latest.get("sumOpenInterest", 0)),
-            "timestamp": datetime.fromtimestamp(int(latest.get("timestamp", 0)) / 1000),
+            # Naive UTC, matching the trade and candle timestamps stored next to it.
+            "timestamp": np.datetime64(int(latest.get("timestamp", 0)), "ms").astype(object),
         }
 
-    def fetch_funding_rates(self, symbol: str = "XRPUSDT") -> List[Dict[str, Any]]:
-        data = self._get(f"{BINANCE_FAPI_BASE}/fapi/v1/fundingRate", params={"symbol": symbol, "limit": 100})
+    def fetch_funding_rates(self, symbol: str = "XRPUSDT") -> RateSeries:
+        return self._cached_get(
+            self._funding_cache,
+            (symbol,),
+            _make_url(FUNDING_RATE_URL, symbol=symbol, limit=100),
+            self._parse_funding_rates,
+        )
+
+    def _parse_funding_rates(self, data: Any) -> RateSeries:
         if not data:
-            now = datetime.utcnow()
-            return [
-                {
-                    "fundingRate": 0.0001,
-                    "fundingTime": now - timedelta(hours=i * 8),
-                }
-                for i in range(5)
-            ]
-        return [
-            {
-                "fundingRate": float(item.get("fundingRate", 0)),
-                "fundingTime": datetime.fromtimestamp(item.get("fundingTime", 0) / 1000),
-            }
-            for item in data
-        ]
+            now_ms = int(time.time() * 1000)
+            return RateSeries(
+                ts_ms=np.array([now_ms - i * 8 * 3_600_000 for i in range(5)], dtype=np.int64),
+                value=np.full(5, 0.0001),
+            )
+        count = len(data)
+        return RateSeries(
+            ts_ms=np.fromiter((item.get("fundingTime", 0) for item in data), dtype=np.int64, count=count),
+            value=np.fromiter((float(item.get("fundingRate", 0)) for item in data), dtype=np.float64, count=count),
+        )
 
-    def fetch_long_short_ratio(self, symbol: str = "XRPUSDT", period: str = "5m") -> List[Dict[str, Any]]:
-        data = self._get(
-            f"{BINANCE_FAPI_BASE}/futures/data/globalLongShortAccountRatio",
-            params={"symbol": symbol, "period": period, "limit": 50},
+    def fetch_long_short_ratio(self, symbol: str = "XRPUSDT", period: str = "5m") -> RateSeries:
+        return self._cached_get(
+            self._lsr_cache,
+            (symbol, period),
+            _make_url(LONG_SHORT_URL, symbol=symbol, period=period, limit=50),
+            self._parse_long_short_ratio,
         )
+
+    def _parse_long_short_ratio(self, data: Any) -> RateSeries:
         if not data:
-            now = datetime.utcnow()
-            return [
-                {"longShortRatio": 1.0 + i * 0.01, "timestamp": now - timedelta(minutes=5 * i)}
-                for i in range(10)
-            ]
-        return [
-            {
-                "longShortRatio": float(item.get("longShortRatio", 0)),
-                "timestamp": datetime.fromtimestamp(int(item.get("timestamp", 0)) / 1000),
-            }
-            for item in data
-        ]
+            now_ms = int(time.time() * 1000)
+            return RateSeries(
+                ts_ms=np.array([now_ms - i * 5 * 60_000 for i in range(10)], dtype=np.int64),
+                value=np.array([1.0 + i * 0.01 for i in range(10)], dtype=np.float64),
+            )
+        count = len(data)
+        return RateSeries(
+            ts_ms=np.fromiter((int(item.get("timestamp", 0)) for item in data), dtype=np.int64, count=count),
+            value=np.fromiter((float(item.get("longShortRatio", 0)) for item in data), dtype=np.float64, count=count),
+        )
 
-    def _fallback_trades(self, limit: int) -> List[Dict[str, Any]]:
-        now = datetime.utcnow()
-        return [
-            {
-                "price": 0.5 + i * 0.0001,
-                "quantity": 100 + i,
-                "timestamp": now - timedelta(seconds=i * 15),
-                "is_buyer_maker": i % 2 == 0,
-            }
-            for i in range(limit)
-        ]
+    def _fallback_trades(self, limit: int) -> TradeBatch:
+        i = np.arange(limit)
+        return TradeBatch(
+            price=0.5 + i * 0.0001,
+            quantity=100.0 + i,
+            ts_ms=int(time.time() * 1000) - i.astype(np.int64) * 15_000,
+            is_buyer_maker=(i & 1) == 0,
+        )
 
-    def _fallback_klines(self, limit: int) -> List[Dict[str, Any]]:
-        now = datetime.utcnow()
-        candles = []
+    def _fallback_klines(self, limit: int) -> KlineBatch:
+        i = np.arange(limit)
         base_price = 0.5
-        for i in range(limit):
-            open_time = now - timedelta(hours=limit - i)
-            candles.append(
-                {
-                    "open_time": open_time,
-                    "open": base_price + i * 0.001,
-                    "high": base_price + i * 0.0015,
-                    "low": base_price + i * 0.0005,
-                    "close": base_price + i * 0.001,
-                    "volume": 100000 + i * 500,
-                }
-            )
-        return candles
+        return KlineBatch(
+            open_time_ms=int(time.time() * 1000) - (limit - i).astype(np.int64) * 3_600_000,
+            open=base_price + i * 0.001,
+            high=base_price + i * 0.0015,
+            low=base_price + i * 0.0005,
+            close=base_price + i * 0.001,
+            volume=100000.0 + i * 500,
+        )
+
+
+@pid_cache
+def get_binance_client() -> BinanceClient:
+    """Per-process instance so response caches and pooled connections survive across workers."""
+    return BinanceClient()
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Dict, List
 
-import httpx
+import numpy as np
+import orjson
+from cachetools import TTLCache
 
 from core.config import get_settings
-from core.utils import retry
+from core.http import get_session
+from core.utils import pid_cache, retry
 
 logger = logging.getLogger(__name__)
 
@@ -17,53 +20,80 @@ CRYPTOCOMPARE_BASE = "https://min-api.cryptocompare.com"
 class CryptoCompareClient:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.session = httpx.Client(timeout=10.0)
+        self.session = get_session()
+        self._ohlcv_cache: TTLCache = TTLCache(maxsize=32, ttl=60)
+        self._breaker: TTLCache = TTLCache(maxsize=32, ttl=30)
 
-    @retry()
-    def _get(self, path: str, params: dict | None = None) -> Any:
+    def _with_key(self, params: dict | None) -> dict:
         params = params or {}
         if self.settings.cryptocompare_api_key:
             params["api_key"] = self.settings.cryptocompare_api_key
+        return params
+
+    @retry()
+    def _request(self, url: str, params: dict | None = None) -> Any:
+        response = self.session.get(url, params=self._with_key(params))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    def _get(self, path: str, params: dict | None = None) -> Any:
+        url = f"{CRYPTOCOMPARE_BASE}{path}"
+        if url in self._breaker:
+            return None
         try:
-            response = self.session.get(f"{CRYPTOCOMPARE_BASE}{path}", params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._request(url, params=params)
         except Exception as exc:
             logger.warning("CryptoCompare request failed: %s", exc)
+            self._breaker[url] = True
             return None
 
     def fetch_ohlcv(self, symbol: str = "XRP", currency: str = "USD", limit: int = 200) -> List[Dict[str, Any]]:
+        key = (symbol, currency, limit)
+        cached = self._ohlcv_cache.get(key)
+        if cached is not None:
+            return cached
         data = self._get("/data/v2/histohour", params={"fsym": symbol, "tsym": currency, "limit": limit})
+        candles = self._parse_ohlcv(data, limit)
+        if data and data.get("Data", {}).get("Data"):
+            self._ohlcv_cache[key] = candles
+        return candles
+
+    def _parse_ohlcv(self, data: Any, limit: int) -> List[Dict[str, Any]]:
         if not data or not data.get("Data", {}).get("Data"):
             return self._fallback_ohlcv(limit)
-        candles: List[Dict[str, Any]] = []
-        for candle in data["Data"]["Data"]:
-            candles.append(
-                {
-                    "time": datetime.fromtimestamp(candle.get("time", 0)),
-                    "open": float(candle.get("open", 0)),
-                    "high": float(candle.get("high", 0)),
-                    "low": float(candle.get("low", 0)),
-                    "close": float(candle.get("close", 0)),
-                    "volume": float(candle.get("volumeto", 0)),
-                }
-            )
-        return candles
+        rows = data["Data"]["Data"]
+        # Epoch seconds convert in one datetime64 cast (naive UTC, like the fallback) instead of per row.
+        times = np.fromiter((candle.get("time", 0) for candle in rows), dtype=np.int64, count=len(rows))
+        return [
+            {
+                "time": ts,
+                "open": float(candle.get("open", 0)),
+                "high": float(candle.get("high", 0)),
+                "low": float(candle.get("low", 0)),
+                "close": float(candle.get("close", 0)),
+                "volume": float(candle.get("volumeto", 0)),
+            }
+            for ts, candle in zip(times.astype("datetime64[s]").tolist(), rows)
+        ]
 
     def _fallback_ohlcv(self, limit: int) -> List[Dict[str, Any]]:
-        now = datetime.utcnow()
-        candles = []
+        i = np.arange(limit)
         base_price = 0.5
-        for i in range(limit):
-            ts = now - timedelta(hours=limit - i)
-            candles.append(
-                {
-                    "time": ts,
-                    "open": base_price + i * 0.0008,
-                    "high": base_price + i * 0.0012,
-                    "low": base_price + i * 0.0005,
-                    "close": base_price + i * 0.0009,
-                    "volume": 75000 + i * 250,
-                }
-            )
-        return candles
+        times = (np.datetime64(datetime.utcnow(), "ms") - (limit - i) * np.timedelta64(1, "h")).astype(object)
+        columns = zip(
+            times,
+            (base_price + i * 0.0008).tolist(),
+            (base_price + i * 0.0012).tolist(),
+            (base_price + i * 0.0005).tolist(),
+            (base_price + i * 0.0009).tolist(),
+            (75000 + i * 250).tolist(),
+        )
+        return [
+            {"time": ts, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for ts, o, h, lo, c, v in columns
+        ]
+
+
+@pid_cache
+def get_cc_client() -> CryptoCompareClient:
+    return CryptoCompareClient()
@@ -1,5 +1,7 @@
 from functools import lru_cache
-from pydantic import BaseSettings, validator
+
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -7,24 +9,24 @@ class Settings(BaseSettings):
     binance_api_secret: str | None = None
     news_api_key: str | None = None
     hf_token: str | None = None
-    hf_model: str = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+    hf_model: str | None = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+    hf_cache_ttl: int = 120
+    news_cache_ttl: int = 90
     cryptocompare_api_key: str | None = None
     deepseek_api_key: str | None = None
     database_url: str
     redis_url: str
 
-    class Config:
-        env_prefix = ''
-        case_sensitive = False
-        env_file = '.env'
+    model_config = SettingsConfigDict(env_prefix='', case_sensitive=False, env_file='.env', extra='ignore')
 
-    @validator('database_url', 'redis_url')
+    @field_validator('database_url', 'redis_url')
+    @classmethod
     def validate_urls(cls, v: str) -> str:
         if not v:
             raise ValueError('Environment variable must be set')
         return v
 
-    @validator(
+    @field_validator(
         'binance_api_key',
         'binance_api_secret',
         'news_api_key',
@@ -32,12 +34,14 @@ class Settings(BaseSettings):
         'hf_model',
         'cryptocompare_api_key',
         'deepseek_api_key',
-        pre=True,
+        mode='before',
     )
+    @classmethod
     def empty_strings_to_none(cls, v):
         return v or None
 
 
+# Settings holds no sockets or file descriptors, so sharing it across forks is safe.
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
@@ -1,32 +1,106 @@
 from datetime import datetime
-from typing import Generator
-
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text, create_engine, inspect
+from typing import Any, Dict, Generator, List, Sequence
+
+import numpy as np
+import orjson
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    create_engine,
+    event,
+    insert,
+    inspect,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import NoSuchModuleError
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from core.config import get_settings
 
 settings = get_settings()
 
 
+def _engine_options(url: str) -> Dict[str, Any]:
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+    # Long-running workers write every tick: keep a warm pool, drop dead connections, cap runaway queries.
+    return {
+        "pool_size": 20,
+        "max_overflow": 40,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "connect_args": {"options": "-c statement_timeout=5000"},
+    }
+
+
+def _sqlite_pragmas(dbapi_conn, _record) -> None:
+    # WAL lets the dashboard read while a worker writes; NORMAL sync fsyncs at checkpoints, not every commit.
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+def _json_serializer(value: Any) -> str:
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+
+
+# JSON columns are (de)serialized with orjson rather than the stdlib json module.
+_JSON_OPTIONS = {"json_serializer": _json_serializer, "json_deserializer": orjson.loads}
+
+
 def _build_engine(url: str):
     try:
-        return create_engine(url, future=True)
+        built = create_engine(url, future=True, **_JSON_OPTIONS, **_engine_options(url))
     except (NoSuchModuleError, ModuleNotFoundError):
         fallback = "sqlite:///./local.db"
-        return create_engine(fallback, future=True)
+        built = create_engine(fallback, future=True, **_JSON_OPTIONS)
+    if built.dialect.name == "sqlite":
+        event.listen(built, "connect", _sqlite_pragmas)
+    return built
 
 
 engine = _build_engine(settings.database_url)
 engine.inspect = inspect
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# Workers read back what they just wrote; expiring on commit would re-SELECT every touched row.
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 
 Base = declarative_base()
 
+# Structured payloads are stored natively (JSONB on Postgres) so the driver hands back dicts/lists
+# without a json.loads per row; pure numeric vectors are stored as raw float32 bytes, which is ample
+# precision for normalized features and projected coordinates at half the row size of float64.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+VECTOR_DTYPE = np.float32
+
+
+def pack_vector(values: Sequence[float] | np.ndarray) -> bytes:
+    return np.ascontiguousarray(values, dtype=VECTOR_DTYPE).tobytes()
+
+
+def unpack_vector(raw: bytes | None) -> np.ndarray:
+    """Decode a packed vector without copying; the returned array is read-only.
+
+    Rows written before vectors were packed hold JSON text, and a driver may hand that back as
+    ``str``; such rows (and truncated blobs) decode to an empty array so callers' size checks drop them.
+    """
+    if not raw or not isinstance(raw, (bytes, bytearray, memoryview)) or len(raw) % VECTOR_DTYPE().itemsize:
+        return np.empty(0, dtype=VECTOR_DTYPE)
+    return np.frombuffer(raw, dtype=VECTOR_DTYPE)
+
 
 class FlowRecord(Base):
     __tablename__ = 'flows'
+    __table_args__ = (Index('ix_flows_ts_exch', 'timestamp', 'exchange'),)
 
     id = Column(Integer, primary_key=True, index=True)
     exchange = Column(String(64), index=True)
@@ -87,8 +161,8 @@ class MarketStateSnapshot(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    state_vector = Column(Text)
-    composite_axes = Column(Text)
+    state_vector = Column(LargeBinary)
+    composite_axes = Column(JSONType)
 
 
 class GeometrySnapshotRecord(Base):
@@ -96,10 +170,10 @@ class GeometrySnapshotRecord(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
-    coords = Column(Text)
+    coords = Column(LargeBinary)
     motif_id = Column(String(64), index=True)
-    transition_probs = Column(Text)
-    local_vector = Column(Text)
+    transition_probs = Column(JSONType)
+    local_vector = Column(LargeBinary)
 
 
 class SwarmSnapshotRecord(Base):
@@ -108,12 +182,75 @@ class SwarmSnapshotRecord(Base):
     id = Column(Integer, primary_key=True, index=True)
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
     motif_id = Column(String(64), index=True)
-    per_horizon = Column(Text)
-    agent_breakdown = Column(Text)
+    per_horizon = Column(JSONType)
+    agent_breakdown = Column(JSONType)
+
+
+_TABLES_READY = False
+
+# Columns that older releases created as TEXT holding json.dumps output.
+_LEGACY_VECTOR_COLUMNS = {
+    "market_state_snapshots": ("state_vector",),
+    "geometry_snapshots": ("coords", "local_vector"),
+}
+_LEGACY_JSON_COLUMNS = {
+    "market_state_snapshots": ("composite_axes",),
+    "geometry_snapshots": ("transition_probs",),
+    "swarm_snapshots": ("per_horizon", "agent_breakdown"),
+}
+
+
+def _legacy_vector(value: Any) -> bytes | None:
+    try:
+        return pack_vector(orjson.loads(value))
+    except (TypeError, ValueError, orjson.JSONDecodeError):
+        return None
+
+
+def _upgrade_legacy_columns() -> None:
+    """Convert TEXT columns left by older releases in place; a no-op once every column has its current type.
+
+    SQLite does not enforce declared column types, so new writes already succeed there and legacy text
+    rows are skipped on read by ``unpack_vector``; only typed backends (Postgres) need the ALTER.
+    """
+    if engine.dialect.name == "sqlite":
+        return
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in _LEGACY_VECTOR_COLUMNS.items():
+            types = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+            for column in columns:
+                if not isinstance(types.get(column), Text):
+                    continue
+                # Text cannot be cast to float32 bytes in SQL: decode in Python, retype, then write back.
+                rows = conn.execute(text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).all()
+                conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE BYTEA USING NULL"))
+                packed = [{"id": row_id, "value": _legacy_vector(value)} for row_id, value in rows]
+                if packed:
+                    conn.execute(text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), packed)
+        for table, columns in _LEGACY_JSON_COLUMNS.items():
+            types = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+            for column in columns:
+                if isinstance(types.get(column), Text):
+                    conn.execute(
+                        text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING NULLIF({column}, '')::jsonb")
+                    )
 
 
 def create_tables() -> None:
+    """Create missing tables once per process; later calls skip the schema reflection round-trip."""
+    global _TABLES_READY
+    if _TABLES_READY:
+        return
     Base.metadata.create_all(bind=engine)
+    _upgrade_legacy_columns()
+    _TABLES_READY = True
+
+
+def bulk_write(db: Session, model, records: List[Dict[str, Any]]) -> None:
+    """Insert many rows in one executemany round-trip, bypassing ORM unit-of-work bookkeeping."""
+    if records:
+        db.execute(insert(model).execution_options(insertmanyvalues_page_size=1000), records)
 
 
 def get_db() -> Generator:
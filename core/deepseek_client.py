@@ -3,36 +3,49 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict
 
-import httpx
+import orjson
+from cachetools import TTLCache
 
 from core.config import get_settings
-from core.utils import retry
+from core.http import get_session
+from core.utils import pid_cache, retry
 
 logger = logging.getLogger(__name__)
 
 DEEPSEEK_BASE = "https://api.deepseek.com"
+ENRICH_URL = f"{DEEPSEEK_BASE}/v1/enrich"
 
 
 class DeepSeekClient:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.session = httpx.Client(timeout=10.0)
+        self.session = get_session()
+        self._breaker: TTLCache = TTLCache(maxsize=32, ttl=30)
 
     @retry()
+    def _request(self, text: str) -> Dict[str, Any]:
+        response = self.session.post(
+            ENRICH_URL,
+            headers={"Authorization": f"Bearer {self.settings.deepseek_api_key}"},
+            json={"text": text},
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
     def enrich(self, text: str) -> Dict[str, Any]:
-        if not self.settings.deepseek_api_key:
+        if not self.settings.deepseek_api_key or ENRICH_URL in self._breaker:
             return self._fallback(text)
         try:
-            response = self.session.post(
-                f"{DEEPSEEK_BASE}/v1/enrich",
-                headers={"Authorization": f"Bearer {self.settings.deepseek_api_key}"},
-                json={"text": text},
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._request(text)
         except Exception as exc:
             logger.warning("DeepSeek enrichment failed: %s", exc)
+            self._breaker[ENRICH_URL] = True
             return self._fallback(text)
 
     def _fallback(self, text: str) -> Dict[str, Any]:
         return {"text": text, "sentiment": "neutral", "confidence": 0.5, "topics": ["xrp", "macro"]}
+
+
+@pid_cache
+def get_deepseek_client() -> DeepSeekClient:
+    return DeepSeekClient()
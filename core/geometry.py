@@ -7,6 +7,7 @@ vector field.
 """
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
 from typing import Dict, Iterable, Optional, Sequence
 
@@ -15,11 +16,20 @@ import numpy as np
 from core.state_space import (
     N_FEATURES,
     N_GEOMETRY_COMPONENTS,
+    StateRing,
     build_state_vector,
     load_state_matrix,
 )
 
 
+MOTIF_TRANSITIONS: Dict[str, Dict[str, float]] = {
+    "grinding_squeeze": {"5m": 0.6, "1h": 0.65, "4h": 0.5},
+    "panic_unwind": {"5m": 0.4, "1h": 0.35, "4h": 0.3},
+    "calm_leverage_build": {"5m": 0.55, "1h": 0.6, "4h": 0.55},
+}
+_DEFAULT_TRANSITIONS: Dict[str, float] = {"5m": 0.5, "1h": 0.5, "4h": 0.5}
+
+
 @dataclass
 class GeometrySnapshot:
     coords: np.ndarray
@@ -63,7 +73,7 @@ class GeometryModel:
             local_drift=zeros,
         )
 
-    def fit(self, history: Iterable[Sequence[float]]) -> None:
+    def fit(self, history: StateRing | Iterable[Sequence[float]]) -> None:
         matrix = load_state_matrix(history)
         if matrix.shape[0] < 10:
             self._components = None
@@ -71,10 +81,17 @@ class GeometryModel:
             self._coords_history = None
             return
 
-        self._means = matrix.mean(axis=0).astype(float)
+        # The projection is a noisy low-rank fit, so float32 halves its footprint at no real cost.
+        matrix = matrix.astype(np.float32, copy=False)
+        self._means = matrix.mean(axis=0)
         centered = matrix - self._means
-        _, _, vt = np.linalg.svd(centered, full_matrices=False)
-        components = vt[: self.n_components]
+        # Only the top components are kept, so eigendecompose the small (F, F) scatter
+        # matrix rather than running a full SVD over every history row.
+        _, eigvecs = np.linalg.eigh(centered.T @ centered)
+        components = np.ascontiguousarray(eigvecs[:, ::-1][:, : self.n_components].T)
+        # Pin the sign ambiguity: the largest loading of each component is positive.
+        pivots = components[np.arange(self.n_components), np.abs(components).argmax(axis=1)]
+        components[pivots < 0] *= -1
         assert components.shape == (self.n_components, self.n_features)
         self._components = components
         self._coords_history = centered @ self._components.T
@@ -85,57 +102,49 @@ class GeometryModel:
             return np.zeros((self.n_components,))
         assert vector.shape == (self.n_features,)
         assert self._components.shape == (self.n_components, self.n_features)
-        centered = vector - self._means
+        centered = vector.astype(np.float32) - self._means
         return centered @ self._components.T
 
     def infer_motif(self, coords: Sequence[float]) -> Optional[str]:
         if coords is None:
             return None
-        radius = np.linalg.norm(coords)
+        # A handful of floats: plain scalar math is cheaper than NumPy's per-call dispatch.
+        values = coords.tolist() if isinstance(coords, np.ndarray) else [float(v) for v in coords]
+        radius = math.sqrt(sum(v * v for v in values))
         if radius < 0.5:
             return "calm_leverage_build"
-        if coords[0] >= 0 and coords[1] >= 0:
+        x, y = values[0], values[1]
+        if x >= 0 and y >= 0:
             return "grinding_squeeze"
-        if coords[0] < 0 and coords[1] < 0:
+        if x < 0 and y < 0:
             return "panic_unwind"
         return "neutral_balance"
 
     def estimate_local_drift(self, coords: np.ndarray) -> np.ndarray:
         if self._coords_history is None:
             return np.zeros((self.n_components,))
-        history = np.vstack([self._coords_history, coords])
-        if history.shape[0] < 2:
-            return np.zeros((self.n_components,))
-        recent = history[-3:]
-        diffs = np.diff(recent, axis=0)
-        return diffs.mean(axis=0)
+        # Mean of consecutive diffs over the last three points telescopes to (last - first) / 2.
+        history = self._coords_history
+        if history.shape[0] >= 2:
+            return (coords - history[-2]) * 0.5
+        if history.shape[0] == 1:
+            return coords - history[-1]
+        return np.zeros((self.n_components,))
 
     def transition_probabilities(self, motif: Optional[str]) -> Dict[str, float]:
         if motif is None:
             return {}
-        if motif == "grinding_squeeze":
-            return {"5m": 0.6, "1h": 0.65, "4h": 0.5}
-        if motif == "panic_unwind":
-            return {"5m": 0.4, "1h": 0.35, "4h": 0.3}
-        if motif == "calm_leverage_build":
-            return {"5m": 0.55, "1h": 0.6, "4h": 0.55}
-        return {"5m": 0.5, "1h": 0.5, "4h": 0.5}
+        # Copy so callers can annotate a snapshot without mutating the shared table.
+        return dict(MOTIF_TRANSITIONS.get(motif, _DEFAULT_TRANSITIONS))
 
     def snapshot(self, state_vector: Sequence[float]) -> GeometrySnapshot:
+        if self._components is None or self._means is None:
+            return self._zero_snapshot()
         try:
-            state = self._validate_vector(state_vector)
+            coords = self.transform(state_vector)
         except ValueError:
             return self._zero_snapshot()
 
-        if self._components is None or self._means is None:
-            return self._zero_snapshot()
-
-        assert state.shape == (self.n_features,)
-        assert self._components.shape == (self.n_components, self.n_features)
-
-        centered = state - self._means
-        coords = centered @ self._components.T
-
         motif = self.infer_motif(coords)
         drift = self.estimate_local_drift(coords)
         transitions = self.transition_probabilities(motif)
@@ -148,4 +157,4 @@ class GeometryModel:
         )
 
 
-__all__ = ["GeometryModel", "GeometrySnapshot"]
+__all__ = ["GeometryModel", "GeometrySnapshot", "MOTIF_TRANSITIONS"]
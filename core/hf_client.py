@@ -1,77 +1,146 @@
 from __future__ import annotations
 
 import logging
+import re
+import threading
 from http import HTTPStatus
 from typing import Any, Dict, List
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
 from core.config import get_settings
+from core.http import get_session
 from core.utils import retry
 
 logger = logging.getLogger(__name__)
 
 HF_API_BASE = "https://api-inference.huggingface.co/models"
 MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+FALLBACK_KEYWORDS: Dict[str, str] = {
+    "sec": "regulatory",
+    "court": "regulatory",
+    "inflation": "macro",
+    "fed": "macro",
+    "liquidity": "market",
+}
+# Lookahead so overlapping keywords (e.g. "sec" + "court" in "secourt") are all reported.
+_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, FALLBACK_KEYWORDS)) + "))")
+# Inputs per batched inference request; keeps payloads well inside the API's request size limit.
+MAX_BATCH_SIZE = 32
 
 
 class HFClient:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.session = httpx.Client(timeout=10.0)
-        self.model_name = self.settings.hf_model or DEFAULT_MODEL
+        self.session = get_session()
+        self.model_name = self.settings.hf_model or MODEL_NAME
         self.remote_disabled = False
+        # Headlines repeat across polling windows; only remote results are cached.
+        self._cache: TTLCache = TTLCache(maxsize=1024, ttl=self.settings.hf_cache_ttl)
+        self._cache_lock = threading.Lock()
+        # Settings are fixed for the process, so the request pieces are built once.
+        self._endpoint = f"{HF_API_BASE}/{self.model_name}"
+        self._auth_headers = {"Authorization": f"Bearer {self.settings.hf_token}"} if self.settings.hf_token else None
 
     @retry()
     def classify(self, text: str) -> Dict[str, Any]:
-        if self.remote_disabled or not self.settings.hf_token:
+        if self.remote_disabled or self._auth_headers is None:
             return self._fallback(text)
+        key = (self.model_name, text)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         try:
-            model_endpoint = f"{HF_API_BASE}/{self.model_name}"
             response = self.session.post(
-                model_endpoint,
-                headers={"Authorization": f"Bearer {self.settings.hf_token}"},
+                self._endpoint,
+                headers=self._auth_headers,
                 json={"inputs": text},
             )
-            if response.status_code == HTTPStatus.GONE:
-                logger.warning(
-                    "HF model %s unavailable (410). Disabling remote classification.",
-                    self.model_name,
-                )
-                self.remote_disabled = True
-                return self._fallback(text)
+            return self._handle_response(response, key, text)
+        except Exception as exc:
+            logger.warning("HF classification failed: %s", exc)
+            return self._fallback(text)
+
+    def classify_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Classify all texts with list-input inference requests; cached texts are not re-sent."""
+        if self.remote_disabled or self._auth_headers is None:
+            return [self._fallback(text) for text in texts]
+        results = [self._cached((self.model_name, text)) for text in texts]
+        pending = list(dict.fromkeys(text for text, result in zip(texts, results) if result is None))
+        classified: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start : start + MAX_BATCH_SIZE]
+            classified.update(zip(chunk, self._classify_chunk(chunk)))
+        return [classified[text] if result is None else result for text, result in zip(texts, results)]
 
+    def _classify_chunk(self, texts: List[str]) -> List[Dict[str, Any]]:
+        if self.remote_disabled:
+            return [self._fallback(text) for text in texts]
+        try:
+            response = self.session.post(
+                self._endpoint,
+                headers=self._auth_headers,
+                json={"inputs": texts},
+            )
+            if self._gone(response):
+                return [self._fallback(text) for text in texts]
             response.raise_for_status()
-            payload = response.json()
-            label, score = self._parse_response(payload)
-            return {"label": label, "score": score}
+            payload = orjson.loads(response.content)
+            if not isinstance(payload, list) or len(payload) != len(texts):
+                raise ValueError(f"expected {len(texts)} results, got {type(payload).__name__}")
         except Exception as exc:
-            logger.warning("HF classification failed: %s", exc)
+            logger.warning("HF batch classification failed: %s", exc)
+            return [self._fallback(text) for text in texts]
+        results = []
+        with self._cache_lock:
+            for text, item in zip(texts, payload):
+                label, score = self._parse_response([item])
+                result = {"label": label, "score": score}
+                self._cache[(self.model_name, text)] = result
+                results.append(result)
+        return results
+
+    def _cached(self, key: tuple[str, str]) -> Dict[str, Any] | None:
+        with self._cache_lock:
+            return self._cache.get(key)
+
+    def _gone(self, response: httpx.Response) -> bool:
+        if response.status_code != HTTPStatus.GONE:
+            return False
+        logger.warning(
+            "HF model %s unavailable (410). Disabling remote classification.",
+            self.model_name,
+        )
+        self.remote_disabled = True
+        return True
+
+    def _handle_response(self, response: httpx.Response, key: tuple[str, str], text: str) -> Dict[str, Any]:
+        if self._gone(response):
             return self._fallback(text)
 
-    def _parse_response(self, payload: Any) -> tuple[str, float]:
-        if isinstance(payload, list) and payload and isinstance(payload[0], list):
-            candidate = payload[0][0] if payload[0] else {}
-        elif isinstance(payload, list) and payload:
-            candidate = payload[0]
-        else:
-            candidate = {}
+        response.raise_for_status()
+        label, score = self._parse_response(orjson.loads(response.content))
+        result = {"label": label, "score": score}
+        with self._cache_lock:
+            self._cache[key] = result
+        return result
 
-        label = candidate.get("label", "neutral") if isinstance(candidate, dict) else "neutral"
-        score = candidate.get("score", 0.5) if isinstance(candidate, dict) else 0.5
-        return label, score
+    def _parse_response(self, payload: Any) -> tuple[str, float]:
+        # Pipelines return either [[{label, score}, ...]] or [{label, score}, ...]; anything else
+        # (error objects, empty lists) falls through to neutral.
+        try:
+            candidate = payload[0][0] if isinstance(payload[0], list) else payload[0]
+            return candidate.get("label", "neutral"), candidate.get("score", 0.5)
+        except (IndexError, KeyError, TypeError, AttributeError):
+            return "neutral", 0.5
 
     def _fallback(self, text: str) -> Dict[str, Any]:
-        keyword_map = {
-            "sec": "regulatory",
-            "court": "regulatory",
-            "inflation": "macro",
-            "fed": "macro",
-            "liquidity": "market",
-        }
-        label = "market"
-        for key, mapped in keyword_map.items():
-            if key in text.lower():
-                label = mapped
-                break
+        # One regex pass finds every keyword; ties resolve in FALLBACK_KEYWORDS order.
+        hits = set(_KEYWORD_RE.findall(text.lower()))
+        label = next((mapped for key, mapped in FALLBACK_KEYWORDS.items() if key in hits), "market")
         return {"label": label, "score": 0.5}
+
+
+__all__ = ["HFClient"]
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+
+import httpx
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=60)
+
+_SESSION: httpx.Client | None = None
+_SESSION_PID: int | None = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> httpx.Client:
+    return httpx.Client(timeout=DEFAULT_TIMEOUT, http2=True, limits=DEFAULT_LIMITS)
+
+
+def get_session() -> httpx.Client:
+    """Return the process-wide pooled client so every REST client shares warm connections.
+
+    The pool holds open sockets, so a forked child drops the inherited client
+    (without closing the parent's connections) and builds its own on first use.
+    """
+    global _SESSION, _SESSION_PID
+    pid = os.getpid()
+    if _SESSION is None or _SESSION_PID != pid:
+        with _SESSION_LOCK:
+            if _SESSION is None or _SESSION_PID != pid:
+                _SESSION = _build_session()
+                _SESSION_PID = pid
+    return _SESSION
+
+
+def build_async_session() -> httpx.AsyncClient:
+    """Async clients are bound to one event loop, so callers own and close them."""
+    return httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, http2=True, limits=DEFAULT_LIMITS)
+
+
+def close_session() -> None:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None and _SESSION_PID == os.getpid():
+            _SESSION.close()
+        _SESSION = None
+
+
+atexit.register(close_session)
+
+
+__all__ = ["DEFAULT_LIMITS", "DEFAULT_TIMEOUT", "build_async_session", "close_session", "get_session"]
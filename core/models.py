@@ -1,10 +1,14 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class Flow(BaseModel):
+class _Model(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+
+class Flow(_Model):
     exchange: str
     direction: str
     volume: float
@@ -12,7 +16,7 @@ class Flow(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
-class Candle(BaseModel):
+class Candle(_Model):
     open: float
     high: float
     low: float
@@ -21,13 +25,13 @@ class Candle(BaseModel):
     timestamp: datetime
 
 
-class OpenInterest(BaseModel):
+class OpenInterest(_Model):
     symbol: str = "XRPUSDT"
     value: float
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
-class Score(BaseModel):
+class Score(_Model):
     composite: float
     flow_pressure: float
     leverage_regime: float
@@ -37,7 +41,7 @@ class Score(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
-class NewsItem(BaseModel):
+class NewsItem(_Model):
     headline: str
     source: str
     url: str
@@ -46,7 +50,7 @@ class NewsItem(BaseModel):
     published_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-class DashboardSnapshot(BaseModel):
+class DashboardSnapshot(_Model):
     flows: List[Flow]
-    scores: Optional[Score]
+    scores: Optional[Score] = None
     news: List[NewsItem]
@@ -1,56 +1,140 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
 from core.config import get_settings
+from core.http import build_async_session, get_session
 from core.utils import retry
 
 logger = logging.getLogger(__name__)
 
 NEWS_API_BASE = "https://newsapi.org/v2"
+EVERYTHING_URL = f"{NEWS_API_BASE}/everything"
+# Stale entries are still served (while a refresh runs) up to this age.
+MAX_STALE_SECONDS = 600
 
 
 class NewsClient:
     def __init__(self) -> None:
         self.settings = get_settings()
-        self.session = httpx.Client(timeout=10.0)
+        self.session = get_session()
+        self._params = {"apiKey": self.settings.news_api_key, "language": "en", "pageSize": 10}
+        # query -> (fetched_at, headlines); fresh for news_cache_ttl, then served stale while refreshing.
+        self._cache: TTLCache = TTLCache(maxsize=32, ttl=MAX_STALE_SECONDS)
+        self._cache_lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self.cache_stats = {"hits": 0, "stale_hits": 0, "misses": 0}
 
-    @retry()
     def fetch_headlines(self, query: str = "XRP") -> List[Dict[str, Any]]:
         if not self.settings.news_api_key:
             return self._fallback_headlines()
+        with self._cache_lock:
+            entry = self._cache.get(query)
+        if entry is not None:
+            fetched_at, headlines = entry
+            if time.monotonic() - fetched_at < self.settings.news_cache_ttl:
+                self.cache_stats["hits"] += 1
+            else:
+                self.cache_stats["stale_hits"] += 1
+                self._schedule_refresh(query)
+            return headlines
+        self.cache_stats["misses"] += 1
+        headlines = self._fetch_remote(query)
+        return headlines if headlines is not None else self._fallback_headlines()
+
+    def _schedule_refresh(self, query: str) -> None:
+        with self._cache_lock:
+            if query in self._refreshing:
+                return
+            self._refreshing.add(query)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="news-refresh")
+                atexit.register(self.close)
+        self._executor.submit(self._refresh, query)
+
+    def _refresh(self, query: str) -> None:
+        try:
+            self._fetch_remote(query)
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(query)
+
+    def close(self) -> None:
+        with self._cache_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            atexit.unregister(self.close)
+
+    @retry()
+    def _request(self, query: str) -> List[Dict[str, Any]]:
+        response = self.session.get(EVERYTHING_URL, params={**self._params, "q": query})
+        response.raise_for_status()
+        data = orjson.loads(response.content).get("articles", [])
+        now = datetime.utcnow()
+        return [self._format_article(article, now) for article in data]
+
+    def _fetch_remote(self, query: str) -> List[Dict[str, Any]] | None:
+        """Fetch and cache live headlines; ``None`` on failure so fallbacks are never cached."""
+        try:
+            headlines = self._request(query)
+        except Exception as exc:
+            logger.warning("News API request failed: %s", exc)
+            return None
+        with self._cache_lock:
+            self._cache[query] = (time.monotonic(), headlines)
+        return headlines
+
+    async def fetch_headlines_async(
+        self, session: httpx.AsyncClient | None = None, query: str = "XRP"
+    ) -> List[Dict[str, Any]]:
+        if not self.settings.news_api_key:
+            return self._fallback_headlines()
+        if session is None:
+            async with build_async_session() as owned:
+                return await self.fetch_headlines_async(owned, query)
         try:
-            response = self.session.get(
-                f"{NEWS_API_BASE}/everything",
-                params={"q": query, "apiKey": self.settings.news_api_key, "language": "en", "pageSize": 10},
+            response = await session.get(
+                EVERYTHING_URL,
+                params={**self._params, "q": query},
             )
             response.raise_for_status()
-            data = response.json().get("articles", [])
-            return [self._format_article(article) for article in data]
+            data = orjson.loads(response.content).get("articles", [])
+            now = datetime.utcnow()
+            return [self._format_article(article, now) for article in data]
         except Exception as exc:
             logger.warning("News API request failed: %s", exc)
             return self._fallback_headlines()
 
-    def _format_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+    def _format_article(self, article: Dict[str, Any], now: datetime) -> Dict[str, Any]:
         return {
             "headline": article.get("title", ""),
             "source": article.get("source", {}).get("name", "unknown"),
             "url": article.get("url", ""),
-            "published_at": self._parse_date(article.get("publishedAt")),
+            "published_at": self._parse_date(article.get("publishedAt"), now),
             "summary": article.get("description", ""),
         }
 
-    def _parse_date(self, value: str | None) -> datetime:
+    def _parse_date(self, value: str | None, now: datetime) -> datetime:
+        # ``now`` is read once per batch, so undated articles share one clock reading.
         if not value:
-            return datetime.utcnow()
+            return now
         try:
-            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+            # Python 3.11 parses the trailing "Z" natively.
+            return datetime.fromisoformat(value)
         except Exception:
-            return datetime.utcnow()
+            return now
 
     def _fallback_headlines(self) -> List[Dict[str, Any]]:
         now = datetime.utcnow()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, Optional
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, List, Mapping, Optional, Sequence
 
+import orjson
 import redis
 
 from core.config import get_settings
@@ -11,24 +14,54 @@ from core.config import get_settings
 logger = logging.getLogger(__name__)
 _CLIENT: redis.Redis | InMemoryRedis | None = None
 
+# Decoded snapshots keyed by Redis key and tagged with the version written alongside them, so an
+# unchanged payload is served without fetching or decoding the blob again.
+_DECODED_MAX = 32
+_decoded: OrderedDict[str, tuple[bytes, Any]] = OrderedDict()
+_decoded_lock = threading.Lock()
+snapshot_cache_stats = {"hits": 0, "misses": 0}
+
 
 class InMemoryRedis:
     def __init__(self) -> None:
-        self._store: dict[str, str] = {}
+        self._store: dict[str, bytes] = {}
+        self._lock = threading.Lock()
 
     def get(self, key: str) -> Optional[bytes]:
-        value = self._store.get(key)
-        return value.encode() if isinstance(value, str) else value
+        with self._lock:
+            return self._store.get(key)
 
     def set(self, key: str, value: Any, ex: int | None = None) -> bool:
-        if isinstance(value, bytes):
-            value = value.decode()
-        self._store[key] = value
+        if not isinstance(value, (bytes, bytearray)):
+            value = str(value).encode()
+        with self._lock:
+            self._store[key] = value
         return True
 
     def ping(self) -> bool:
         return True
 
+    def pipeline(self, transaction: bool = True) -> "InMemoryPipeline":
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, client: InMemoryRedis) -> None:
+        self._client = client
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    def get(self, key: str) -> "InMemoryPipeline":
+        self._calls.append(("get", (key,), {}))
+        return self
+
+    def set(self, key: str, value: Any, ex: int | None = None) -> "InMemoryPipeline":
+        self._calls.append(("set", (key, value), {"ex": ex}))
+        return self
+
+    def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in calls]
+
 
 def _build_client():
     settings = get_settings()
@@ -48,21 +81,77 @@ def get_client():
     return _CLIENT
 
 
+# Snapshots carry numpy scalars/arrays and datetimes straight from the workers.
+_DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _version_key(key: str) -> str:
+    return f"{key}:v"
+
+
+def cache_snapshot_many(payloads: Mapping[str, Any], expire: int = 600) -> None:
+    """Write several snapshots (and their version tags) in one pipelined round-trip."""
+    pipe = get_client().pipeline(transaction=False)
+    for key, payload in payloads.items():
+        # The payload goes first: a reader that sees the new version is guaranteed the new payload.
+        pipe.set(key, orjson.dumps(payload, default=str, option=_DUMPS_OPTIONS), ex=expire)
+        pipe.set(_version_key(key), uuid.uuid4().hex, ex=expire)
+    pipe.execute()
+
+
 def cache_snapshot(key: str, payload: Any, expire: int = 600) -> None:
-    client = get_client()
-    serialized = json.dumps(payload, default=str)
-    client.set(key, serialized, ex=expire)
+    cache_snapshot_many({key: payload}, expire=expire)
 
 
-def get_snapshot(key: str) -> Any:
-    client = get_client()
-    raw = client.get(key)
-    if not raw:
-        return None
+def _decode(raw: bytes) -> Any:
     try:
-        return json.loads(raw)
-    except (TypeError, json.JSONDecodeError):
+        return orjson.loads(raw)
+    except (TypeError, orjson.JSONDecodeError):
         return raw
 
 
-__all__ = ["get_client", "cache_snapshot", "get_snapshot"]
+def _cached(key: str, version: bytes | None) -> tuple[bool, Any]:
+    if version:
+        with _decoded_lock:
+            cached = _decoded.get(key)
+            if cached is not None and cached[0] == version:
+                _decoded.move_to_end(key)
+                snapshot_cache_stats["hits"] += 1
+                return True, cached[1]
+    snapshot_cache_stats["misses"] += 1
+    return False, None
+
+
+def _store(key: str, version: bytes | None, raw: bytes | None) -> Any:
+    if not raw:
+        return None
+    value = _decode(raw)
+    if version:
+        with _decoded_lock:
+            _decoded[key] = (version, value)
+            _decoded.move_to_end(key)
+            if len(_decoded) > _DECODED_MAX:
+                _decoded.popitem(last=False)
+    return value
+
+
+def get_snapshot(key: str) -> Any:
+    """Return the decoded snapshot; unchanged payloads come back as the same shared object."""
+    return get_many([key])[0]
+
+
+def get_many(keys: Sequence[str]) -> List[Any]:
+    """Fetch several snapshots in one pipelined round-trip."""
+    pipe = get_client().pipeline(transaction=False)
+    for key in keys:
+        pipe.get(_version_key(key))
+        pipe.get(key)
+    replies = pipe.execute()
+    snapshots = []
+    for key, version, raw in zip(keys, replies[::2], replies[1::2]):
+        hit, value = _cached(key, version)
+        snapshots.append(value if hit else _store(key, version, raw))
+    return snapshots
+
+
+__all__ = ["get_client", "cache_snapshot", "cache_snapshot_many", "get_many", "get_snapshot"]
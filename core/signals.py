@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List
+from typing import Deque, Dict, List, Optional, Sequence
 
 import numpy as np
 
-from core.exchange_addresses import EXCHANGE_ADDRESSES
-from core.utils import ewma, zscore
-
 
 @dataclass
 class SignalResult:
@@ -20,41 +19,108 @@ class SignalResult:
     composite: float
 
 
-def volume_anomaly(volumes: List[float]) -> float:
-    if len(volumes) < 5:
+@dataclass
+class StreamingStats:
+    """O(1) running z-score over the last ``window`` observations (Welford add/remove)."""
+
+    window: Optional[int] = None
+    min_count: int = 5
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    last: float = 0.0
+    _values: Deque[float] = field(default_factory=deque, repr=False)
+
+    def _add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = x - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (x - self.mean), 0.0)
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if self.window is not None:
+            self._values.append(x)
+            if len(self._values) > self.window:
+                self._remove(self._values.popleft())
+        self._add(x)
+        self.last = x
+        return self.zscore()
+
+    def zscore(self) -> float:
+        if self.count < self.min_count:
+            return 0.0
+        std = (self.m2 / self.count) ** 0.5 or 1
+        return (self.last - self.mean) / std
+
+
+def _flow_columns(flows: List[Dict[str, float]]) -> tuple[np.ndarray, np.ndarray]:
+    count = len(flows)
+    volumes = np.fromiter((flow.get("volume", 0) for flow in flows), dtype=np.float64, count=count)
+    signs = np.fromiter(
+        (1 if flow.get("direction", "inflow") == "inflow" else -1 for flow in flows), dtype=np.int8, count=count
+    )
+    return volumes, signs
+
+
+def _volume_anomaly_arr(volumes: np.ndarray) -> float:
+    if volumes.size < 5:
         return 0.0
-    return float(zscore(volumes)[-1])
+    std = volumes.std() or 1
+    return float((volumes[-1] - volumes.mean()) / std)
 
 
-def accumulation_distribution(flows: List[Dict[str, float]], prices: List[float]) -> float:
-    if not flows or not prices:
+def _accumulation_arr(flow_volumes: np.ndarray, prices: Sequence[float]) -> float:
+    if not flow_volumes.size or len(prices) == 0:
         return 0.0
-    flow_volume = sum(item.get("volume", 0) for item in flows)
-    price_change = prices[-1] - prices[0] if len(prices) > 1 else 0
-    divergence = price_change - flow_volume * 1e-6
+    price_change = float(prices[-1] - prices[0]) if len(prices) > 1 else 0
+    divergence = price_change - float(flow_volumes.sum()) * 1e-6
     return max(min(divergence, 1.0), -1.0)
 
 
-def flow_pressure(flows: List[Dict[str, float]]) -> float:
-    if not flows:
+def _flow_pressure_arr(flow_volumes: np.ndarray, flow_signs: np.ndarray) -> float:
+    if not flow_volumes.size:
         return 0.0
-    exchange_weights = {addr: 1 for addresses in EXCHANGE_ADDRESSES.values() for addr in addresses}
-    pressure = 0.0
-    for flow in flows:
-        direction = flow.get("direction", "inflow")
-        sign = 1 if direction == "inflow" else -1
-        pressure += sign * flow.get("volume", 0) * 1e-6
-    normalized = max(min(pressure, 1.0), -1.0)
-    return normalized
+    pressure = float((flow_signs * flow_volumes).sum()) * 1e-6
+    return max(min(pressure, 1.0), -1.0)
 
 
-def leverage_regime(open_interest: float, funding_rates: List[float], long_short_ratios: List[float]) -> float:
+def _leverage_arr(open_interest: float, funding_rates: np.ndarray, long_short_ratios: np.ndarray) -> float:
     if open_interest <= 0:
         return 0.0
-    funding_bias = np.mean(funding_rates) if funding_rates else 0
-    lsr_bias = np.mean(long_short_ratios) - 1 if long_short_ratios else 0
-    raw = np.tanh(open_interest * 1e-8 + funding_bias + lsr_bias)
-    return float(raw)
+    funding_bias = float(funding_rates.mean()) if funding_rates.size else 0.0
+    lsr_bias = float(long_short_ratios.mean()) - 1 if long_short_ratios.size else 0.0
+    # Scalar input: math.tanh skips the ufunc dispatch and 0-d array round-trip.
+    return math.tanh(open_interest * 1e-8 + funding_bias + lsr_bias)
+
+
+def volume_anomaly(volumes: List[float]) -> float:
+    return _volume_anomaly_arr(np.asarray(volumes, dtype=np.float64))
+
+
+def accumulation_distribution(flows: List[Dict[str, float]], prices: List[float]) -> float:
+    return _accumulation_arr(_flow_columns(flows)[0], prices)
+
+
+def flow_pressure(flows: List[Dict[str, float]]) -> float:
+    return _flow_pressure_arr(*_flow_columns(flows))
+
+
+def leverage_regime(open_interest: float, funding_rates: List[float], long_short_ratios: List[float]) -> float:
+    return _leverage_arr(
+        open_interest,
+        np.asarray(funding_rates, dtype=np.float64),
+        np.asarray(long_short_ratios, dtype=np.float64),
+    )
 
 
 def manipulation_heuristic(depth_imbalance: float = 0.0, spoofing_score: float = 0.0) -> float:
@@ -79,17 +145,35 @@ def composite_score(values: Dict[str, float]) -> float:
 def build_signals(
     volumes: List[float],
     flows: List[Dict[str, float]],
-    prices: List[float],
+    prices: Sequence[float],
     open_interest: float,
     funding_rates: List[float],
     long_short_ratios: List[float],
     depth_imbalance: float = 0.0,
     spoofing_score: float = 0.0,
+    volume_stats: StreamingStats | None = None,
+    new_volumes: Sequence[float] = (),
 ) -> SignalResult:
-    anomaly = volume_anomaly(volumes)
-    accumulation = accumulation_distribution(flows, prices)
-    pressure = flow_pressure(flows)
-    leverage = leverage_regime(open_interest, funding_rates, long_short_ratios)
+    """Score one tick of market data.
+
+    With ``volume_stats``, the volume anomaly comes from the running window instead of
+    re-scanning ``volumes``; ``new_volumes`` are the observations it has not seen yet.
+    """
+    # Convert every input once; the sub-signals share these arrays.
+    flow_volumes, flow_signs = _flow_columns(flows)
+    if volume_stats is not None:
+        for volume in new_volumes:
+            volume_stats.update(volume)
+        anomaly = volume_stats.zscore()
+    else:
+        anomaly = _volume_anomaly_arr(np.asarray(volumes, dtype=np.float64))
+    accumulation = _accumulation_arr(flow_volumes, prices)
+    pressure = _flow_pressure_arr(flow_volumes, flow_signs)
+    leverage = _leverage_arr(
+        open_interest,
+        np.asarray(funding_rates, dtype=np.float64),
+        np.asarray(long_short_ratios, dtype=np.float64),
+    )
     manipulation = manipulation_heuristic(depth_imbalance, spoofing_score)
     composite = composite_score(
         {
@@ -9,7 +9,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Iterable, List, Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence
 
 import numpy as np
 
@@ -42,6 +42,30 @@ COMPOSITE_KEYS: List[str] = [
     "headline_axis",
 ]
 
+RAW_IDX: Dict[str, int] = {key: i for i, key in enumerate(RAW_FEATURE_KEYS)}
+# Position of every named feature (raw or composite) inside ``MarketState.vector``.
+FEATURE_INDEX: Dict[str, int] = {key: i for i, key in enumerate(RAW_FEATURE_KEYS + COMPOSITE_KEYS)}
+
+_COMPOSITE_MEMBERS: Dict[str, tuple[str, ...]] = {
+    "flow_axis": ("net_flow", "exchange_concentration", "stablecoin_rotation"),
+    "leverage_axis": ("open_interest", "funding_skew", "perp_basis"),
+    "pressure_axis": ("orderbook_imbalance", "aggressive_volume"),
+    "headline_axis": ("headline_risk", "headline_count", "headline_recency"),
+}
+
+
+def _composite_weights() -> np.ndarray:
+    weights = np.zeros((len(COMPOSITE_KEYS), len(RAW_FEATURE_KEYS)))
+    for row, axis in enumerate(COMPOSITE_KEYS):
+        members = [RAW_IDX[key] for key in _COMPOSITE_MEMBERS[axis]]
+        weights[row, members] = 1.0 / len(members)
+    return weights
+
+
+# Each composite axis is the mean of its member features, i.e. one row of an averaging matrix.
+_COMPOSITE_WEIGHTS = _composite_weights()
+_COMPOSITE_IDX: Dict[str, int] = {key: FEATURE_INDEX[key] for key in COMPOSITE_KEYS}
+
 
 def _validate_vector(vector: np.ndarray) -> np.ndarray:
     vector = np.asarray(vector, dtype=float).reshape(-1)
@@ -50,91 +74,117 @@ def _validate_vector(vector: np.ndarray) -> np.ndarray:
     return vector.reshape((N_FEATURES,))
 
 
-@dataclass
+class FeatureView(Mapping[str, float]):
+    """Read-only name -> value mapping backed by positions in a state vector."""
+
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: np.ndarray, index: Mapping[str, int]) -> None:
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, key: str) -> float:
+        return float(self._values[self._index[key]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+@dataclass(slots=True)
 class MarketState:
     """Container for a single market state snapshot."""
 
     timestamp: datetime
     raw_features: Dict[str, float]
-    normalized_features: Dict[str, float]
-    composite_axes: Dict[str, float]
+    normalized_features: Mapping[str, float]
+    composite_axes: Mapping[str, float]
     vector: np.ndarray = field(default_factory=lambda: np.zeros(N_FEATURES, dtype=float))
 
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp.isoformat(),
             "raw_features": self.raw_features,
-            "normalized_features": self.normalized_features,
-            "composite_axes": self.composite_axes,
+            "normalized_features": dict(self.normalized_features),
+            "composite_axes": dict(self.composite_axes),
             "vector": self.vector.tolist(),
         }
 
 
-def _zscore(value: float, mean: float, std: float) -> float:
-    if std == 0:
-        return 0.0
-    return (value - mean) / std
+class StateRing:
+    """Fixed-capacity rolling window of state vectors in one preallocated float32 buffer."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("StateRing capacity must be positive.")
+        self.capacity = capacity
+        self._buf = np.zeros((capacity, N_FEATURES), dtype=np.float32)
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, vector: MarketState | np.ndarray | Sequence[float]) -> None:
+        if isinstance(vector, MarketState):
+            vector = vector.vector
+        self._buf[self._next] = _validate_vector(vector)
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def extend(self, vectors: Iterable[MarketState | np.ndarray | Sequence[float]]) -> None:
+        for vector in vectors:
+            self.push(vector)
+
+    def clear(self) -> None:
+        self._size = 0
+        self._next = 0
+
+    def view(self) -> np.ndarray:
+        """Rows oldest-first; only copies once the buffer has wrapped around."""
+        if self._size < self.capacity:
+            return self._buf[: self._size]
+        if self._next == 0:
+            return self._buf
+        return np.concatenate((self._buf[self._next :], self._buf[: self._next]))
 
 
 def _normalize_features(
     raw_inputs: Mapping[str, float],
     rolling_stats: Mapping[str, tuple[float, float]] | None = None,
-) -> Dict[str, float]:
-    normalized: Dict[str, float] = {}
-    for key in RAW_FEATURE_KEYS:
-        value = float(raw_inputs.get(key, 0.0))
-        if rolling_stats and key in rolling_stats:
-            mean, std = rolling_stats[key]
-        else:
-            mean, std = value, abs(value) if value != 0 else 1.0
-        normalized[key] = _zscore(value, mean, std)
-    return normalized
-
-
-def _composite_axes(normalized_features: Mapping[str, float]) -> Dict[str, float]:
-    flow_axis = np.mean(
-        [
-            normalized_features.get("net_flow", 0.0),
-            normalized_features.get("exchange_concentration", 0.0),
-            normalized_features.get("stablecoin_rotation", 0.0),
-        ]
-    )
-    leverage_axis = np.mean(
-        [
-            normalized_features.get("open_interest", 0.0),
-            normalized_features.get("funding_skew", 0.0),
-            normalized_features.get("perp_basis", 0.0),
-        ]
-    )
-    pressure_axis = np.mean(
-        [
-            normalized_features.get("orderbook_imbalance", 0.0),
-            normalized_features.get("aggressive_volume", 0.0),
-        ]
-    )
-    headline_axis = np.mean(
-        [
-            normalized_features.get("headline_risk", 0.0),
-            normalized_features.get("headline_count", 0.0),
-            normalized_features.get("headline_recency", 0.0),
-        ]
+) -> np.ndarray:
+    raw = np.fromiter(
+        (float(raw_inputs.get(key, 0.0)) for key in RAW_FEATURE_KEYS),
+        dtype=float,
+        count=len(RAW_FEATURE_KEYS),
     )
-
-    return {
-        "flow_axis": float(flow_axis),
-        "leverage_axis": float(leverage_axis),
-        "pressure_axis": float(pressure_axis),
-        "headline_axis": float(headline_axis),
-    }
-
-
-def _vector_from_features(
-    normalized_features: Mapping[str, float],
-    composite_axes: Mapping[str, float],
+    mean = raw.copy()
+    std = np.where(raw != 0, np.abs(raw), 1.0)
+    if rolling_stats:
+        for key, (key_mean, key_std) in rolling_stats.items():
+            idx = RAW_IDX.get(key)
+            if idx is not None:
+                mean[idx] = key_mean
+                std[idx] = key_std
+    zero = std == 0
+    return np.where(zero, 0.0, (raw - mean) / np.where(zero, 1.0, std))
+
+
+def _state_vector(
+    raw_inputs: Mapping[str, float],
+    rolling_stats: Mapping[str, tuple[float, float]] | None = None,
 ) -> np.ndarray:
-    values = [float(normalized_features.get(key, 0.0)) for key in RAW_FEATURE_KEYS]
-    values.extend(float(composite_axes.get(key, 0.0)) for key in COMPOSITE_KEYS)
-    return _validate_vector(np.array(values, dtype=float))
+    n_raw = len(RAW_FEATURE_KEYS)
+    vector = np.empty(N_FEATURES)
+    vector[:n_raw] = _normalize_features(raw_inputs, rolling_stats)
+    # Composite means are written straight into the tail: no list, no concatenate.
+    np.dot(_COMPOSITE_WEIGHTS, vector[:n_raw], out=vector[n_raw:])
+    return vector
 
 
 def build_state_vector(
@@ -148,9 +198,7 @@ def build_state_vector(
     """
 
     if isinstance(raw_inputs, Mapping):
-        normalized_features = _normalize_features(raw_inputs, rolling_stats)
-        composite = _composite_axes(normalized_features)
-        return _vector_from_features(normalized_features, composite)
+        return _state_vector(raw_inputs, rolling_stats)
 
     return _validate_vector(np.asarray(raw_inputs, dtype=float))
 
@@ -160,19 +208,39 @@ def build_market_state(
     raw_inputs: Mapping[str, float],
     rolling_stats: Mapping[str, tuple[float, float]] | None = None,
 ) -> MarketState:
-    normalized_features = _normalize_features(raw_inputs, rolling_stats)
-    composite = _composite_axes(normalized_features)
-    vector = _vector_from_features(normalized_features, composite)
+    vector = _state_vector(raw_inputs, rolling_stats)
+    # Normalized and composite values already live in the vector; expose them as views.
     return MarketState(
         timestamp=timestamp,
         raw_features=dict(raw_inputs),
-        normalized_features=normalized_features,
-        composite_axes=composite,
+        normalized_features=FeatureView(vector, RAW_IDX),
+        composite_axes=FeatureView(vector, _COMPOSITE_IDX),
         vector=vector,
     )
 
 
-def load_state_matrix(states: Iterable[MarketState | np.ndarray | Sequence[float]]) -> np.ndarray:
+def _stack_rows(states: StateRing | Iterable[MarketState | np.ndarray | Sequence[float]]) -> np.ndarray | None:
+    """Stack an already rectangular history in one call; ``None`` means rows need checking one by one."""
+    if isinstance(states, StateRing):
+        return states.view()
+    if isinstance(states, np.ndarray):
+        matrix = states
+    elif isinstance(states, list) and states and not isinstance(states[0], MarketState):
+        try:
+            matrix = np.asarray(states, dtype=float)
+        except (TypeError, ValueError):
+            return None
+    else:
+        return None
+    if matrix.ndim != 2 or matrix.shape[1] != N_FEATURES:
+        return None
+    return matrix if matrix.dtype.kind == "f" else matrix.astype(float)
+
+
+def load_state_matrix(states: StateRing | Iterable[MarketState | np.ndarray | Sequence[float]]) -> np.ndarray:
+    matrix = _stack_rows(states)
+    if matrix is not None:
+        return matrix
     vectors: List[np.ndarray] = []
     for state in states:
         if isinstance(state, MarketState):
@@ -189,10 +257,13 @@ def load_state_matrix(states: Iterable[MarketState | np.ndarray | Sequence[float
 
 
 __all__ = [
+    "FEATURE_INDEX",
+    "FeatureView",
     "MarketState",
     "N_COMPONENTS",
     "N_FEATURES",
     "N_GEOMETRY_COMPONENTS",
+    "StateRing",
     "build_market_state",
     "build_state_vector",
     "load_state_matrix",
@@ -1,12 +1,16 @@
 """Swarm predictor layer with lightweight agents and volume aggregation."""
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Mapping, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
 
 import numpy as np
 
-from core.state_space import MarketState
+from core.state_space import FEATURE_INDEX, MarketState
+
+
+UP_LABELS = frozenset({"UP", "EVENT_YES"})
 
 
 @dataclass
@@ -31,6 +35,20 @@ class SwarmSnapshot:
         }
 
 
+@dataclass
+class SwarmBatch:
+    """Per-tick swarm output for a block of states: agent arrays are (T, agents), horizon arrays (T, horizons)."""
+
+    horizons: List[str]
+    margins: np.ndarray
+    active: np.ndarray
+    up_strength: np.ndarray
+    down_strength: np.ndarray
+    total_votes: np.ndarray
+    swarm_score: np.ndarray
+    persistence: np.ndarray
+
+
 @dataclass
 class SwarmAgentConfig:
     name: str
@@ -46,68 +64,177 @@ class SwarmAgent:
 
     def __init__(self, config: SwarmAgentConfig, coefficients: List[float], intercept: float = 0.0):
         self.config = config
-        self.coefficients = np.array(coefficients)
-        self.intercept = intercept
+        self.coefficients = np.ascontiguousarray(coefficients, dtype=np.float64)
+        self.intercept = float(intercept)
+        self._threshold = config.threshold
+        self._labels = config.direction_labels
+        # Each name is read from its own source: schema features are gathered from the state
+        # vector, anything outside the schema comes from the raw inputs.
+        names = config.feature_subset
+        self._schema_pos = np.array([i for i, name in enumerate(names) if name in FEATURE_INDEX], dtype=np.intp)
+        self._feat_idx = np.array([FEATURE_INDEX[name] for name in names if name in FEATURE_INDEX], dtype=np.intp)
+        self._raw_names = [(i, name) for i, name in enumerate(names) if name not in FEATURE_INDEX]
 
     def _feature_vector(self, state: MarketState) -> np.ndarray:
-        values = []
-        for name in self.config.feature_subset:
-            values.append(
-                state.normalized_features.get(name)
-                or state.composite_axes.get(name)
-                or state.raw_features.get(name)
-                or 0.0
-            )
-        return np.array(values)
+        if not self._raw_names:
+            return state.vector[self._feat_idx]
+        values = np.empty(len(self.config.feature_subset))
+        values[self._schema_pos] = state.vector[self._feat_idx]
+        for i, name in self._raw_names:
+            values[i] = state.raw_features.get(name) or 0.0
+        return values
 
     def predict(self, state: MarketState) -> Optional[SwarmVote]:
         features = self._feature_vector(state)
         if features.size == 0:
             return None
-        margin = float(np.dot(features, self.coefficients) + self.intercept)
-        strength = abs(margin)
-        if strength < self.config.threshold:
+        margin = float(features @ self.coefficients + self.intercept)
+        strength = math.fabs(margin)
+        if strength < self._threshold:
             return None
-        direction = self.config.direction_labels[0] if margin >= 0 else self.config.direction_labels[1]
+        direction = self._labels[margin < 0.0]
         return SwarmVote(direction=direction, strength=strength, horizon=self.config.horizon, target=self.config.target)
 
 
 class SwarmEnsemble:
     def __init__(self, agents: Iterable[SwarmAgent]) -> None:
         self.agents = list(agents)
-        self.persistence_state: Dict[str, float] = {}
+        # Every agent's coefficients are scattered into one (n_agents, n_columns) matrix so a single
+        # GEMV scores the whole swarm. Columns are the union of feature names; schema names are
+        # gathered from the state vector and the rest are read from raw inputs.
+        keys = list(dict.fromkeys(name for agent in self.agents for name in agent.config.feature_subset))
+        columns = {name: j for j, name in enumerate(keys)}
+        self._schema_cols = np.array([j for j, name in enumerate(keys) if name in FEATURE_INDEX], dtype=np.intp)
+        self._schema_idx = np.array([FEATURE_INDEX[name] for name in keys if name in FEATURE_INDEX], dtype=np.intp)
+        self._raw_cols = [(j, name) for j, name in enumerate(keys) if name not in FEATURE_INDEX]
+        self._C = np.zeros((len(self.agents), len(keys)))
+        for i, agent in enumerate(self.agents):
+            np.add.at(self._C[i], [columns[name] for name in agent.config.feature_subset], agent.coefficients)
+        self._b = np.array([agent.intercept for agent in self.agents], dtype=float)
+        self._silent = np.array([not agent.config.feature_subset for agent in self.agents], dtype=bool)
+        self._thresholds = np.array([agent.config.threshold for agent in self.agents], dtype=float)
+        # Per-agent horizon codes and which label counts as "up", so votes aggregate with bincount.
+        self._horizons: List[str] = list(dict.fromkeys(agent.config.horizon for agent in self.agents))
+        horizon_codes = {horizon: code for code, horizon in enumerate(self._horizons)}
+        self._horizon_codes = np.array([horizon_codes[agent.config.horizon] for agent in self.agents], dtype=np.intp)
+        self._up_if_positive = np.array([a.config.direction_labels[0] in UP_LABELS for a in self.agents], dtype=bool)
+        self._up_if_negative = np.array([a.config.direction_labels[1] in UP_LABELS for a in self.agents], dtype=bool)
+        # Per-call scratch for margins and strengths; predict returns fresh dicts, so only these
+        # intermediates (never exposed to callers) are reused.
+        self._margin_buf = np.empty(len(self.agents))
+        self._strength_buf = np.empty(len(self.agents))
+        self._x = np.empty(len(keys))
+        # Persistence is an EWMA of each horizon's swarm score, updated only when it receives votes.
+        self._persistence = np.zeros(len(self._horizons))
+        self._persisted = np.zeros(len(self._horizons), dtype=bool)
+
+    @property
+    def persistence_state(self) -> Dict[str, float]:
+        return {
+            self._horizons[code]: float(self._persistence[code]) for code in np.flatnonzero(self._persisted).tolist()
+        }
 
-    def _aggregate_votes(self, votes: List[SwarmVote]) -> Dict[str, Dict[str, float]]:
+    def _aggregate_votes(
+        self, active: np.ndarray, margins: np.ndarray, strengths: np.ndarray
+    ) -> Dict[str, Dict[str, float]]:
+        if not active.size:
+            return {}
+        codes = self._horizon_codes[active]
+        weights = strengths[active]
+        is_up = np.where(margins[active] >= 0, self._up_if_positive[active], self._up_if_negative[active])
+        n_horizons = len(self._horizons)
+        up = np.bincount(codes, weights=np.where(is_up, weights, 0.0), minlength=n_horizons)
+        down = np.bincount(codes, weights=np.where(is_up, 0.0, weights), minlength=n_horizons)
+        counts = np.bincount(codes, minlength=n_horizons)
+        denom = up + down
+        raw_scores = (up - down) / np.where(denom == 0, 1.0, denom)
+
+        seen, first = np.unique(codes, return_index=True)
+        self._persistence[seen] = 0.7 * self._persistence[seen] + 0.3 * raw_scores[seen]
+        self._persisted[seen] = True
+
+        # Horizons are reported in the order their first vote appeared.
         by_horizon: Dict[str, Dict[str, float]] = {}
-        for vote in votes:
-            horizon_bucket = by_horizon.setdefault(vote.horizon, {"up_strength": 0.0, "down_strength": 0.0, "total_votes": 0})
-            if vote.direction in ("UP", "EVENT_YES"):
-                horizon_bucket["up_strength"] += vote.strength
-            else:
-                horizon_bucket["down_strength"] += vote.strength
-            horizon_bucket["total_votes"] += 1
-
-        for horizon, metrics in by_horizon.items():
-            denom = metrics["up_strength"] + metrics["down_strength"] or 1.0
-            raw_score = (metrics["up_strength"] - metrics["down_strength"]) / denom
-            previous = self.persistence_state.get(horizon, 0.0)
-            persistence = 0.7 * previous + 0.3 * raw_score
-            metrics.update({"swarm_score": raw_score, "persistence": persistence})
-            self.persistence_state[horizon] = persistence
+        for code in seen[np.argsort(first)].tolist():
+            by_horizon[self._horizons[code]] = {
+                "up_strength": float(up[code]),
+                "down_strength": float(down[code]),
+                "total_votes": int(counts[code]),
+                "swarm_score": float(raw_scores[code]),
+                "persistence": float(self._persistence[code]),
+            }
         return by_horizon
 
+    def _margins(self, state: MarketState) -> np.ndarray:
+        x = self._x
+        x[self._schema_cols] = state.vector[self._schema_idx]
+        for j, name in self._raw_cols:
+            x[j] = state.raw_features.get(name) or 0.0
+        margins = np.matmul(self._C, x, out=self._margin_buf)
+        margins += self._b
+        margins[self._silent] = np.nan
+        return margins
+
+    def predict_batch(
+        self, vectors: np.ndarray, raw_features: Sequence[Mapping[str, float]] | None = None
+    ) -> SwarmBatch:
+        """Score T state vectors at once, advancing persistence exactly as T calls to ``predict`` would."""
+        vectors = np.asarray(vectors, dtype=np.float64)
+        n_ticks, n_horizons = vectors.shape[0], len(self._horizons)
+        X = np.zeros((n_ticks, self._x.size))
+        X[:, self._schema_cols] = vectors[:, self._schema_idx]
+        if raw_features is not None:
+            for j, name in self._raw_cols:
+                X[:, j] = [row.get(name) or 0.0 for row in raw_features]
+        margins = X @ self._C.T
+        margins += self._b
+        margins[:, self._silent] = np.nan
+        strengths = np.abs(margins)
+        with np.errstate(invalid="ignore"):
+            active = strengths >= self._thresholds
+
+        is_up = np.where(margins >= 0, self._up_if_positive, self._up_if_negative)
+        # Flatten (tick, horizon) into one bincount key so every tick aggregates in one C loop.
+        keys = (np.arange(n_ticks)[:, None] * n_horizons + self._horizon_codes)[active]
+        weights = strengths[active]
+        up_mask = is_up[active]
+        size = n_ticks * n_horizons
+        up = np.bincount(keys, weights=np.where(up_mask, weights, 0.0), minlength=size).reshape(n_ticks, n_horizons)
+        down = np.bincount(keys, weights=np.where(up_mask, 0.0, weights), minlength=size).reshape(n_ticks, n_horizons)
+        counts = np.bincount(keys, minlength=size).reshape(n_ticks, n_horizons)
+        denom = up + down
+        scores = (up - down) / np.where(denom == 0, 1.0, denom)
+
+        # The persistence recurrence is sequential in time but vectorized across horizons.
+        persistence = np.empty((n_ticks, n_horizons))
+        for t in range(n_ticks):
+            voted = counts[t] > 0
+            self._persistence[voted] = 0.7 * self._persistence[voted] + 0.3 * scores[t, voted]
+            self._persisted |= voted
+            persistence[t] = self._persistence
+        return SwarmBatch(
+            horizons=list(self._horizons),
+            margins=margins,
+            active=active,
+            up_strength=up,
+            down_strength=down,
+            total_votes=counts,
+            swarm_score=scores,
+            persistence=persistence,
+        )
+
     def predict(self, state: MarketState, motif_id: str | None = None) -> SwarmSnapshot:
-        votes = []
+        margins = self._margins(state)
+        strengths = np.abs(margins, out=self._strength_buf)
+        with np.errstate(invalid="ignore"):
+            active = np.flatnonzero(strengths >= self._thresholds)
         breakdown = []
-        for agent in self.agents:
-            vote = agent.predict(state)
-            if not vote:
-                continue
-            votes.append(vote)
-            breakdown.append({"name": agent.config.name, "horizon": agent.config.horizon, "target": agent.config.target})
-
-        per_horizon = self._aggregate_votes(votes)
+        for i in active.tolist():
+            config = self.agents[i].config
+            breakdown.append({"name": config.name, "horizon": config.horizon, "target": config.target})
+
+        per_horizon = self._aggregate_votes(active, margins, strengths)
         return SwarmSnapshot(per_horizon=per_horizon, agent_breakdown=breakdown, motif_id=motif_id)
 
 
-__all__ = ["SwarmAgent", "SwarmAgentConfig", "SwarmEnsemble", "SwarmSnapshot", "SwarmVote"]
+__all__ = ["SwarmAgent", "SwarmAgentConfig", "SwarmBatch", "SwarmEnsemble", "SwarmSnapshot", "SwarmVote"]
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import logging
+import math
+import os
+import random
+import threading
 import time
 from functools import wraps
 from typing import Any, Callable, Iterable
@@ -11,28 +15,74 @@ import numpy as np
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+_EWMA_MAX_EXPONENT = 100 * math.log(10)
 
-def retry(attempts: int = 3, delay: float = 1.0) -> Callable:
+
+def retry(attempts: int = 3, base: float = 0.1, cap: float = 2.0, jitter: bool = True) -> Callable:
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exc = None
             for attempt in range(attempts):
                 try:
                     return func(*args, **kwargs)
-                except Exception as exc:  # pylint: disable=broad-except
-                    last_exc = exc
-                    time.sleep(delay)
-            if last_exc:
-                raise last_exc
+                except Exception:  # pylint: disable=broad-except
+                    if attempt == attempts - 1:
+                        raise
+                    delay = min(cap, base * 2**attempt)
+                    time.sleep(delay * random.uniform(0.5, 1.5) if jitter else delay)
 
         return wrapper
 
     return decorator
 
 
+def pid_cache(func: Callable) -> Callable:
+    """Memoize per process so a forked worker builds its own instance instead of inheriting sockets."""
+    cache: dict = {}
+    lock = threading.Lock()
+
+    @wraps(func)
+    def wrapper(*args):
+        key = (os.getpid(),) + args
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        with lock:
+            if key not in cache:
+                for stale in [k for k in cache if k[0] != key[0]]:
+                    del cache[stale]
+                cache[key] = func(*args)
+        return cache[key]
+
+    return wrapper
+
+
+def run_every(func: Callable[[], Any], interval: float) -> None:
+    """Call ``func`` forever on a fixed monotonic cadence.
+
+    A slow call only shortens the following sleep; a call that overruns whole intervals skips
+    the missed slots instead of firing back-to-back to catch up.
+    """
+    next_tick = time.monotonic()
+    while True:
+        func()
+        next_tick += interval
+        now = time.monotonic()
+        if interval > 0 and next_tick < now:
+            next_tick += math.ceil((now - next_tick) / interval) * interval
+        time.sleep(max(0.0, next_tick - now))
+
+
+def _as_float_array(values: Iterable[float]) -> np.ndarray:
+    # Arrays and sequences convert without an intermediate list (zero-copy for float64 arrays).
+    if isinstance(values, (np.ndarray, list, tuple)):
+        return np.asarray(values, dtype=np.float64)
+    return np.fromiter(values, dtype=np.float64)
+
+
 def zscore(values: Iterable[float]) -> np.ndarray:
-    arr = np.array(list(values), dtype=float)
+    arr = _as_float_array(values)
     if arr.size == 0:
         return np.array([])
     mean = arr.mean()
@@ -41,12 +91,22 @@ def zscore(values: Iterable[float]) -> np.ndarray:
 
 
 def ewma(values: Iterable[float], span: int = 10) -> np.ndarray:
-    arr = np.array(list(values), dtype=float)
+    arr = _as_float_array(values)
     if arr.size == 0:
         return np.array([])
     alpha = 2 / (span + 1)
-    result = np.zeros_like(arr)
-    result[0] = arr[0]
-    for i in range(1, len(arr)):
-        result[i] = alpha * arr[i] + (1 - alpha) * result[i - 1]
+    decay = 1 - alpha
+    if decay <= 0:
+        return arr.copy()
+    # Closed form per block: y_j = decay**j * (decay * y_prev + alpha * cumsum(x_i / decay**i)).
+    # Blocks keep decay**-i below ~1e100 so the cumulative sum cannot overflow.
+    block = max(1, int(_EWMA_MAX_EXPONENT / -math.log(decay)))
+    result = np.empty_like(arr)
+    prev = arr[0]
+    for start in range(0, arr.size, block):
+        chunk = arr[start : start + block]
+        powers = decay ** np.arange(chunk.size)
+        smoothed = powers * (decay * prev + alpha * np.cumsum(chunk / powers))
+        result[start : start + chunk.size] = smoothed
+        prev = smoothed[-1]
     return result
@@ -1,10 +1,8 @@
-import json
 from datetime import datetime, timezone
 
-import pandas as pd
 import streamlit as st
 
-from core.redis_client import get_snapshot
+from core.redis_client import get_many
 
 st.set_page_config(page_title="XRP Intelligence Terminal", layout="wide")
 st.markdown(
@@ -19,12 +17,10 @@ st.markdown(
 )
 
 
-@st.cache_data(ttl=60)
 def load_snapshots():
-    flows = get_snapshot("flows:latest") or {}
-    scores = get_snapshot("scores:latest") or {}
-    news = get_snapshot("news:latest") or []
-    return flows, scores, news
+    # Redis is the cache: unchanged snapshots are served from get_many's decoded copies in one round-trip.
+    flows, scores, news = get_many(["flows:latest", "scores:latest", "news:latest"])
+    return flows or {}, scores or {}, news or []
 
 
 def render_header():
@@ -35,17 +31,24 @@ def render_header():
 def render_flow_section(flows_snapshot):
     st.subheader("Exchange Inflow/Outflow Pressure", anchor=False)
     flows = flows_snapshot.get("flows", [])
-    df = pd.DataFrame(flows)
-    if df.empty:
+    if not flows:
         st.info("No flow data available yet.")
         return
-    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', utc=True, errors='coerce')
-    df = df.dropna(subset=['timestamp'])
-    inflow = df[df['direction'] == 'inflow']['volume'].sum()
-    outflow = df[df['direction'] == 'outflow']['volume'].sum()
+    import pandas as pd
+
+    # Built column-wise rather than from the list of dicts; rows whose timestamp does not parse
+    # are left out of both the totals and the chart.
+    timestamps = pd.to_datetime(
+        [flow.get('timestamp') for flow in flows], format='ISO8601', utc=True, errors='coerce'
+    )
+    valid = timestamps.notna()
+    volumes = pd.Series([flow.get('volume') for flow in flows], index=timestamps, dtype=float)[valid]
+    directions = pd.Series([flow.get('direction') for flow in flows], index=timestamps)[valid]
+    inflow = volumes[directions == 'inflow'].sum()
+    outflow = volumes[directions == 'outflow'].sum()
     st.metric("Inflow Volume", f"{inflow:,.0f}")
     st.metric("Outflow Volume", f"{outflow:,.0f}")
-    st.line_chart(df.set_index('timestamp')[['volume']])
+    st.line_chart(volumes.to_frame('volume'))
 
 
 def render_derivatives(scores_snapshot):
@@ -91,6 +94,8 @@ def render_volume_table(flows_snapshot):
     ohlcv = flows_snapshot.get("ohlcv", [])
     if not ohlcv:
         return
+    import pandas as pd
+
     df = pd.DataFrame(ohlcv)
     df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', utc=True, errors='coerce')
     df = df.dropna(subset=['timestamp'])
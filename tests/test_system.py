@@ -1,5 +1,7 @@
 import os
 import sys
+import types
+from datetime import datetime
 
 import pytest
 
@@ -10,9 +12,33 @@ os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from core.db import create_tables, engine  # noqa: E402
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+import orjson  # noqa: E402
+from cachetools import TTLCache  # noqa: E402
+
+from core import news_client  # noqa: E402
+from core.db import (  # noqa: E402
+    MarketStateSnapshot,
+    SessionLocal,
+    SwarmSnapshotRecord,
+    create_tables,
+    engine,
+    pack_vector,
+    unpack_vector,
+)
+from core.hf_client import HFClient  # noqa: E402
 from core.redis_client import cache_snapshot, get_snapshot  # noqa: E402
 from core.signals import build_signals  # noqa: E402
+from core.state_space import (  # noqa: E402
+    FEATURE_INDEX,
+    N_FEATURES,
+    StateRing,
+    build_market_state,
+    load_state_matrix,
+)
+from core.swarm import SwarmAgent, SwarmAgentConfig, SwarmEnsemble  # noqa: E402
+from workers.swarm_worker import SwarmWorker  # noqa: E402
 
 
 def test_create_tables():
@@ -46,3 +72,187 @@ def test_signals_deterministic():
     )
     assert -1.0 <= result.composite <= 1.0
     assert result.manipulation_score >= 0
+
+
+def test_state_ring_keeps_latest_rows_in_order():
+    ring = StateRing(capacity=3)
+    for value in range(5):
+        ring.push([float(value)] * N_FEATURES)
+    matrix = load_state_matrix(ring)
+    assert matrix.shape == (3, N_FEATURES)
+    assert matrix[:, 0].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_swarm_ensemble_matches_per_agent_votes():
+    state = build_market_state(
+        datetime(2024, 1, 1),
+        {"net_flow": -3.0, "open_interest": 2.0, "headline_risk": 1.0},
+        {"net_flow": (1.0, 2.0), "open_interest": (0.5, 1.0), "headline_risk": (0.0, 0.5)},
+    )
+    agents = [
+        SwarmAgent(SwarmAgentConfig("flow", ["net_flow", "flow_axis"], "1h", "price"), [1.0, 0.5]),
+        SwarmAgent(SwarmAgentConfig("lev", ["open_interest"], "4h", "price", threshold=2.0), [1.0]),
+        SwarmAgent(SwarmAgentConfig("news", ["headline_risk", "spot"], "5m", "event"), [0.5, 1.0], 0.1),
+    ]
+    snapshot = SwarmEnsemble(agents).predict(state)
+    expected = [agent.config.name for agent in agents if agent.predict(state)]
+    assert [entry["name"] for entry in snapshot.agent_breakdown] == expected == ["flow", "news"]
+
+
+def test_swarm_agent_reads_each_feature_from_its_own_source():
+    state = build_market_state(
+        datetime(2024, 1, 1),
+        {"net_flow": -3.0, "open_interest": 2.0, "foo": 0.25},
+        {"net_flow": (1.0, 2.0), "open_interest": (0.5, 1.0)},
+    )
+    agent = SwarmAgent(SwarmAgentConfig("mixed", ["net_flow", "foo", "flow_axis"], "1h", "price"), [1.0, 2.0, 3.0])
+    expected = [state.vector[FEATURE_INDEX["net_flow"]], 0.25, state.vector[FEATURE_INDEX["flow_axis"]]]
+    assert np.allclose(agent._feature_vector(state), expected)
+    margins = SwarmEnsemble([agent])._margins(state)
+    assert np.isclose(margins[0], np.dot(expected, [1.0, 2.0, 3.0]))
+
+
+def test_swarm_predict_batch_matches_sequential_predict():
+    rng = np.random.default_rng(0)
+    names = list(FEATURE_INDEX)
+
+    def make_ensemble():
+        agents = [
+            SwarmAgent(
+                SwarmAgentConfig(f"a{i}", [names[i], names[-i - 1]], ["5m", "1h"][i % 2], "price", threshold=0.4),
+                [1.0 - 0.2 * i, 0.3],
+            )
+            for i in range(6)
+        ]
+        agents.append(SwarmAgent(SwarmAgentConfig("raw", ["spot_price", "foo"], "1d", "price"), [1.0, 0.5]))
+        return SwarmEnsemble(agents)
+
+    states = [
+        build_market_state(
+            datetime(2024, 1, 1),
+            {name: float(rng.normal()) for name in names},
+            {name: (0.0, 1.0) for name in names},
+        )
+        for _ in range(5)
+    ]
+    sequential, batched = make_ensemble(), make_ensemble()
+    snapshots = [sequential.predict(state) for state in states]
+    batch = batched.predict_batch(np.stack([s.vector for s in states]), [s.raw_features for s in states])
+    for t, snapshot in enumerate(snapshots):
+        for horizon, stats in snapshot.per_horizon.items():
+            h = batch.horizons.index(horizon)
+            assert batch.total_votes[t, h] == stats["total_votes"]
+            assert np.isclose(batch.swarm_score[t, h], stats["swarm_score"])
+            assert np.isclose(batch.persistence[t, h], stats["persistence"])
+    assert batched.persistence_state.keys() == sequential.persistence_state.keys()
+
+
+def test_unpack_vector_drops_legacy_text_rows():
+    assert unpack_vector("[0.1, 0.2, 0.3]").size == 0
+    assert unpack_vector(b"\x00\x01\x02").size == 0
+    assert unpack_vector(pack_vector([1.0, 2.0])).tolist() == [1.0, 2.0]
+
+
+def test_swarm_worker_persists_latest_state_snapshot():
+    worker = SwarmWorker()
+    vector = np.zeros(N_FEATURES)
+    vector[FEATURE_INDEX["net_flow"]] = -2.0
+    db = SessionLocal()
+    row = MarketStateSnapshot(timestamp=datetime(2100, 1, 1), state_vector=pack_vector(vector), composite_axes={})
+    try:
+        db.add(row)
+        db.commit()
+        worker.run_once()
+        record = db.query(SwarmSnapshotRecord).order_by(SwarmSnapshotRecord.id.desc()).first()
+        # No new state since the last tick: nothing is scored or written.
+        worker.run_once()
+        assert db.query(SwarmSnapshotRecord).order_by(SwarmSnapshotRecord.id.desc()).first().id == record.id
+    finally:
+        db.delete(row)
+        db.commit()
+        db.close()
+        worker.close()
+    assert [entry["name"] for entry in record.agent_breakdown] == ["flow_momentum"]
+    assert get_snapshot("swarm:latest")["per_horizon"] == record.per_horizon
+
+
+def test_swarm_worker_skips_wrong_length_state_vector():
+    worker = SwarmWorker()
+    vector = np.zeros(N_FEATURES)
+    vector[FEATURE_INDEX["net_flow"]] = -2.0
+    db = SessionLocal()
+    # Packed as float64, this decodes to twice the expected float32 length.
+    row = MarketStateSnapshot(timestamp=datetime(2200, 1, 1), state_vector=vector.tobytes(), composite_axes={})
+    try:
+        db.add(row)
+        db.commit()
+        before = db.query(SwarmSnapshotRecord).count()
+        worker.run_once()
+        assert db.query(SwarmSnapshotRecord).count() == before
+    finally:
+        db.delete(row)
+        db.commit()
+        db.close()
+        worker.close()
+
+
+def test_hf_client_disables_remote_on_410():
+    client = HFClient()
+    assert client.remote_disabled is False
+    client._auth_headers = {"Authorization": "Bearer test"}
+    client.session = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(410)))
+    result = client.classify("SEC files motion")
+    assert client.remote_disabled is True
+    assert result == {"label": "regulatory", "score": 0.5}
+
+
+def test_hf_client_classify_batch_sends_one_request():
+    requests = []
+
+    def handler(request):
+        inputs = orjson.loads(request.content)["inputs"]
+        requests.append(inputs)
+        return httpx.Response(200, json=[[{"label": "POSITIVE", "score": 0.9}] for _ in inputs])
+
+    client = HFClient()
+    client._auth_headers = {"Authorization": "Bearer test"}
+    client.session = httpx.Client(transport=httpx.MockTransport(handler))
+    results = client.classify_batch(["a", "b", "a"])
+    assert requests == [["a", "b"]]
+    assert results == [{"label": "POSITIVE", "score": 0.9}] * 3
+    client.classify_batch(["b", "c"])
+    assert requests[-1] == ["c"]
+
+
+def test_news_client_serves_stale_headlines_while_refreshing(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(news_client, "time", types.SimpleNamespace(monotonic=lambda: clock[0]))
+    client = news_client.NewsClient()
+    client.settings = client.settings.model_copy(update={"news_api_key": "test", "news_cache_ttl": 90})
+    client._cache = TTLCache(maxsize=32, ttl=news_client.MAX_STALE_SECONDS, timer=lambda: clock[0])
+    calls = []
+
+    def fake_request(query):
+        calls.append(query)
+        return [{"headline": f"h{len(calls)}"}]
+
+    client._request = fake_request
+    try:
+        assert client.fetch_headlines() == [{"headline": "h1"}]
+        clock[0] = 30.0
+        assert client.fetch_headlines() == [{"headline": "h1"}]
+        assert len(calls) == 1
+
+        # Past the freshness TTL the cached copy is returned at once and refreshed in the background.
+        clock[0] = 100.0
+        assert client.fetch_headlines() == [{"headline": "h1"}]
+        client.close()
+        assert len(calls) == 2
+        assert client.fetch_headlines() == [{"headline": "h2"}]
+
+        # Past the stale window the entry is gone and the next call fetches synchronously.
+        clock[0] = 100.0 + news_client.MAX_STALE_SECONDS + 1
+        assert client.fetch_headlines() == [{"headline": "h3"}]
+        assert client.cache_stats == {"hits": 2, "stale_hits": 1, "misses": 2}
+    finally:
+        client.close()
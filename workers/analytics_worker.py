@@ -5,19 +5,55 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
 import argparse
-import time
 from datetime import datetime
+from typing import Any, Dict
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from core.db import OHLCVRecord, OpenInterestRecord, ScoreRecord, SessionLocal, create_tables
+from core.db import ScoreRecord, SessionLocal, bulk_write, create_tables
 from core.redis_client import cache_snapshot, get_snapshot
-from core.signals import build_signals
+from core.signals import StreamingStats, build_signals
+from core.utils import run_every
 
 
 class AnalyticsWorker:
-    def run_once(self) -> None:
+    def __init__(self, flush_every: int = 1) -> None:
         create_tables()
+        self.volume_stats = StreamingStats(window=200)
+        self._last_candle_ts: str | None = None
+        # Score rows are buffered and written in one executemany every ``flush_every`` ticks.
+        self.flush_every = max(1, flush_every)
+        self._pending: list[dict] = []
+
+    def flush(self, db: Session) -> None:
+        if not self._pending:
+            return
+        bulk_write(db, ScoreRecord, self._pending)
+        db.commit()
+        self._pending.clear()
+
+    def _candle_columns(self, ohlcv: list) -> tuple[list, list, np.ndarray]:
+        """One pass over the candles: every volume and close, plus the volumes of candles not yet seen."""
+        prices = np.empty(len(ohlcv))
+        volumes = []
+        new_volumes = []
+        last_seen = self._last_candle_ts
+        newest = None
+        for i, candle in enumerate(ohlcv):
+            prices[i] = candle.get("close", 0)
+            volumes.append(candle.get("volume", 0))
+            timestamp = str(candle.get("timestamp", ""))
+            if last_seen is None or timestamp > last_seen:
+                new_volumes.append(volumes[-1])
+                newest = timestamp
+        if newest is not None:
+            self._last_candle_ts = newest
+        return volumes, new_volumes, prices
+
+    def run_once(self, context: Dict[str, Any] | None = None) -> None:
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
         db: Session = SessionLocal()
         try:
             snapshot = get_snapshot("flows:latest") or {}
@@ -30,12 +66,11 @@ class AnalyticsWorker:
                     {
                         "close": 0.5,
                         "volume": 100000,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": now_iso,
                     }
                 ]
 
-            volumes = [candle.get("volume", 0) for candle in ohlcv]
-            prices = [candle.get("close", 0) for candle in ohlcv]
+            volumes, new_volumes, prices = self._candle_columns(ohlcv)
             open_interest_value = float(open_interest_data.get("value", 0))
 
             funding_rates = [0.0001] * 5
@@ -48,19 +83,23 @@ class AnalyticsWorker:
                 open_interest=open_interest_value,
                 funding_rates=funding_rates,
                 long_short_ratios=long_short,
+                volume_stats=self.volume_stats,
+                new_volumes=new_volumes,
             )
 
-            record = ScoreRecord(
-                composite=signals.composite,
-                flow_pressure=signals.flow_pressure,
-                leverage_regime=signals.leverage_regime,
-                accumulation=signals.accumulation_score,
-                manipulation=signals.manipulation_score,
-                anomaly=signals.anomaly_z,
-                timestamp=datetime.utcnow(),
+            self._pending.append(
+                {
+                    "composite": signals.composite,
+                    "flow_pressure": signals.flow_pressure,
+                    "leverage_regime": signals.leverage_regime,
+                    "accumulation": signals.accumulation_score,
+                    "manipulation": signals.manipulation_score,
+                    "anomaly": signals.anomaly_z,
+                    "timestamp": now,
+                }
             )
-            db.add(record)
-            db.commit()
+            if len(self._pending) >= self.flush_every:
+                self.flush(db)
 
             cache_snapshot(
                 "scores:latest",
@@ -71,7 +110,7 @@ class AnalyticsWorker:
                     "accumulation": signals.accumulation_score,
                     "manipulation": signals.manipulation_score,
                     "anomaly": signals.anomaly_z,
-                    "timestamp": record.timestamp.isoformat(),
+                    "timestamp": now_iso,
                 },
             )
         finally:
@@ -82,18 +121,24 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Analytics worker")
     parser.add_argument("--loop", action="store_true", help="Loop execution")
     parser.add_argument("--interval", type=int, default=600, help="Loop interval seconds")
+    parser.add_argument("--flush-every", type=int, default=1, help="Ticks buffered per score insert")
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    worker = AnalyticsWorker()
-    if args.loop:
-        while True:
+    worker = AnalyticsWorker(flush_every=args.flush_every)
+    try:
+        if args.loop:
+            run_every(worker.run_once, args.interval)
+        else:
             worker.run_once()
-            time.sleep(args.interval)
-    else:
-        worker.run_once()
+    finally:
+        db = SessionLocal()
+        try:
+            worker.flush(db)
+        finally:
+            db.close()
 
 
 if __name__ == "__main__":
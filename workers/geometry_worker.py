@@ -5,69 +5,89 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
 import argparse
-import json
-import time
+import hashlib
 from datetime import datetime, timezone
-from typing import List, Sequence
+from typing import Any, Dict
 
+import numpy as np
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from core.db import GeometrySnapshotRecord, MarketStateSnapshot, SessionLocal, create_tables
+from core.db import (
+    GeometrySnapshotRecord,
+    MarketStateSnapshot,
+    SessionLocal,
+    create_tables,
+    pack_vector,
+    unpack_vector,
+)
 from core.geometry import GeometryModel
 from core.redis_client import cache_snapshot
-from core.state_space import N_FEATURES, build_state_vector
+from core.state_space import N_FEATURES, StateRing, build_state_vector
+from core.utils import run_every
 
 
 class GeometryWorker:
     """Projects market states into the geometry space and persists snapshots."""
 
-    def __init__(self) -> None:
+    def __init__(self, history_size: int = 500) -> None:
+        create_tables()
         self.model = GeometryModel()
-
-    def _load_vector(self, raw_vector: Sequence[float]) -> Sequence[float] | None:
-        try:
-            vector = build_state_vector(raw_vector)
-        except ValueError:
-            return None
-        if vector.shape != (N_FEATURES,):
-            return None
-        return vector
-
-    def _fetch_state_history(self, db: Session, limit: int = 500) -> List[Sequence[float]]:
-        rows = (
-            db.query(MarketStateSnapshot)
-            .order_by(MarketStateSnapshot.timestamp.desc())
-            .limit(limit)
-            .all()
+        # The rolling window lives in one preallocated buffer; each tick only appends states newer
+        # than the last one read, so the history is not re-fetched and re-stacked every time.
+        self._ring = StateRing(history_size)
+        self._last_ts: datetime | None = None
+        # Digest of the history the model was last fitted on; an unchanged window skips the refit.
+        self._history_digest: bytes | None = None
+
+    def _fit(self, history: np.ndarray) -> None:
+        digest = hashlib.blake2b(history.tobytes(), digest_size=16).digest()
+        if digest == self._history_digest:
+            return
+        self.model.fit(history)
+        self._history_digest = digest
+
+    def _fetch_state_history(self, db: Session) -> np.ndarray:
+        # Newest rows past the watermark (at most a window's worth), re-ordered oldest-first by the
+        # database; plain Core rows, no ORM objects.
+        latest = select(MarketStateSnapshot.timestamp, MarketStateSnapshot.state_vector)
+        if self._last_ts is not None:
+            latest = latest.where(MarketStateSnapshot.timestamp > self._last_ts)
+        latest = latest.order_by(MarketStateSnapshot.timestamp.desc()).limit(self._ring.capacity).subquery()
+        # Stream in batches so a cold start never buffers the full window as raw rows alongside the vectors.
+        stmt = (
+            select(latest.c.timestamp, latest.c.state_vector)
+            .order_by(latest.c.timestamp.asc())
+            .execution_options(yield_per=100)
         )
-        raw_history: List[Sequence[float]] = []
-        for row in reversed(rows):
-            raw_vector = json.loads(row.state_vector) if row.state_vector else []
-            raw_history.append(raw_vector)
-
-        history: List[Sequence[float]] = []
-        for raw in raw_history:
-            vector = self._load_vector(raw)
-            if vector is not None:
-                history.append(vector)
-        return history
-
-    def run_once(self) -> None:
-        create_tables()
+
+        vectors = []
+        for timestamp, state_vector in db.execute(stmt):
+            self._last_ts = timestamp
+            vector = unpack_vector(state_vector)
+            if vector.size == N_FEATURES:
+                vectors.append(vector)
+        if vectors:
+            # Validate the new rows at once: malformed rows were dropped above, non-finite ones go here.
+            batch = np.stack(vectors)
+            self._ring.extend(batch[np.isfinite(batch).all(axis=1)])
+        return self._ring.view()
+
+    def run_once(self, context: Dict[str, Any] | None = None) -> None:
         db: Session = SessionLocal()
         try:
             history = self._fetch_state_history(db)
-            current_state = history[-1] if history else build_state_vector([0.0] * N_FEATURES)
+            current_state = history[-1] if len(history) else build_state_vector([0.0] * N_FEATURES)
 
-            self.model.fit(history)
+            self._fit(history)
             snapshot = self.model.snapshot(current_state)
 
             record = GeometrySnapshotRecord(
                 timestamp=datetime.now(timezone.utc),
-                coords=json.dumps(snapshot.coords.tolist()),
+                coords=pack_vector(snapshot.coords),
                 motif_id=snapshot.motif_id,
-                transition_probs=json.dumps(snapshot.motif_transition_probs),
-                local_vector=json.dumps(snapshot.local_drift.tolist()),
+                transition_probs=snapshot.motif_transition_probs,
+                local_vector=pack_vector(snapshot.local_drift),
             )
             db.add(record)
             db.commit()
@@ -75,10 +95,10 @@ class GeometryWorker:
             cache_snapshot(
                 "geometry:latest",
                 {
-                    "coords": snapshot.coords.tolist(),
+                    "coords": snapshot.coords,
                     "motif_id": snapshot.motif_id,
                     "motif_transition_probs": snapshot.motif_transition_probs,
-                    "local_drift": snapshot.local_drift.tolist(),
+                    "local_drift": snapshot.local_drift,
                 },
             )
         finally:
@@ -96,9 +116,7 @@ def main() -> None:
     args = parse_args()
     worker = GeometryWorker()
     if args.loop:
-        while True:
-            worker.run_once()
-            time.sleep(args.interval)
+        run_every(worker.run_once, args.interval)
     else:
         worker.run_once()
 
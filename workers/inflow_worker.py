@@ -5,68 +5,90 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
 import argparse
-import time
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
 
 from sqlalchemy.orm import Session
 
-from core.binance_client import BinanceClient
-from core.cc_client import CryptoCompareClient
-from core.db import FlowRecord, OHLCVRecord, OpenInterestRecord, SessionLocal, create_tables
+from core.binance_client import get_binance_client
+from core.cc_client import get_cc_client
+from core.db import FlowRecord, OHLCVRecord, OpenInterestRecord, SessionLocal, bulk_write, create_tables
 from core.redis_client import cache_snapshot
+from core.utils import run_every
 
 
 class InflowWorker:
     def __init__(self) -> None:
-        self.binance = BinanceClient()
-        self.cc = CryptoCompareClient()
+        create_tables()
+        self.binance = get_binance_client()
+        self.cc = get_cc_client()
+        # The three sources are independent I/O-bound calls; one pool is reused across ticks.
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="inflow-fetch")
 
     def _fetch_flows(self):
-        return self.binance.get_recent_flows()
+        trades = self.binance.fetch_agg_trades()
+        # A maker buyer means the taker sold into the book: count it as sell-side (inflow) pressure.
+        # Timestamps convert in one datetime64 cast to naive UTC datetimes, matching the DateTime columns.
+        return [
+            {
+                "exchange": "binance",
+                "direction": "inflow" if maker else "outflow",
+                "volume": quantity,
+                "price": price,
+                "timestamp": timestamp,
+            }
+            for price, quantity, timestamp, maker in zip(
+                trades.price.tolist(),
+                trades.quantity.tolist(),
+                trades.ts.tolist(),
+                trades.is_buyer_maker.tolist(),
+            )
+        ]
 
     def _fetch_ohlcv(self):
-        return self.cc.get_recent_ohlcv()
+        return [
+            {
+                "open": candle["open"],
+                "high": candle["high"],
+                "low": candle["low"],
+                "close": candle["close"],
+                "volume": candle["volume"],
+                "timestamp": candle["time"],
+            }
+            for candle in self.cc.fetch_ohlcv()
+        ]
 
     def _fetch_open_interest(self):
-        return self.binance.get_open_interest()
+        return self.binance.fetch_futures_open_interest()
 
     def _save_flows(self, db: Session, flows):
-        for flow in flows:
-            record = FlowRecord(
-                volume=flow["volume"],
-                direction=flow["direction"],
-                timestamp=datetime.fromtimestamp(flow["timestamp"], tz=timezone.utc),
-            )
-            db.add(record)
+        bulk_write(db, FlowRecord, flows)
 
     def _save_ohlcv(self, db: Session, ohlcv):
-        for candle in ohlcv:
-            record = OHLCVRecord(
-                open=candle["open"],
-                high=candle["high"],
-                low=candle["low"],
-                close=candle["close"],
-                volume=candle["volume"],
-                timestamp=datetime.fromtimestamp(candle["timestamp"], tz=timezone.utc),
-            )
-            db.add(record)
+        bulk_write(db, OHLCVRecord, ohlcv)
 
     def _save_open_interest(self, db: Session, open_interest):
-        record = OpenInterestRecord(value=open_interest, timestamp=datetime.now(timezone.utc))
+        record = OpenInterestRecord(
+            symbol=open_interest["symbol"],
+            value=open_interest["openInterest"],
+            timestamp=open_interest["timestamp"],
+        )
         db.add(record)
 
-    def run_once(self) -> None:
-        create_tables()
+    def run_once(self, context: Dict[str, Any] | None = None) -> None:
+        flows_future = self._executor.submit(self._fetch_flows)
+        ohlcv_future = self._executor.submit(self._fetch_ohlcv)
+        open_interest_future = self._executor.submit(self._fetch_open_interest)
+        flows = flows_future.result()
+        ohlcv = ohlcv_future.result()
+        open_interest = open_interest_future.result()
+
         db: Session = SessionLocal()
         try:
-            flows = self._fetch_flows()
-            ohlcv = self._fetch_ohlcv()
-            open_interest = self._fetch_open_interest()
-
             self._save_flows(db, flows)
             self._save_ohlcv(db, ohlcv)
             self._save_open_interest(db, open_interest)
-
+            # One commit covers all three inserts, so a tick costs a single transaction.
             db.commit()
 
             cache_snapshot(
@@ -74,12 +96,21 @@ class InflowWorker:
                 {
                     "flows": flows,
                     "ohlcv": ohlcv,
-                    "open_interest": {"value": open_interest, "timestamp": datetime.now(timezone.utc).isoformat()},
+                    "open_interest": {
+                        "value": open_interest["openInterest"],
+                        "timestamp": open_interest["timestamp"].isoformat(),
+                    },
                 },
             )
+        except Exception:
+            db.rollback()
+            raise
         finally:
             db.close()
 
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Exchange inflow/outflow worker")
@@ -91,12 +122,13 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     worker = InflowWorker()
-    if args.loop:
-        while True:
+    try:
+        if args.loop:
+            run_every(worker.run_once, args.interval)
+        else:
             worker.run_once()
-            time.sleep(args.interval)
-    else:
-        worker.run_once()
+    finally:
+        worker.close()
 
 
 if __name__ == "__main__":
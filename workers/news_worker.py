@@ -5,65 +5,75 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
 import argparse
-import time
-from datetime import datetime, timezone
+from typing import Any, Dict
 
 from sqlalchemy.orm import Session
 
-from core.db import NewsRecord, SessionLocal, create_tables
+from core.db import NewsRecord, SessionLocal, bulk_write, create_tables
 from core.hf_client import HFClient
 from core.news_client import NewsClient
-from core.redis_client import cache_snapshot
+from core.redis_client import cache_snapshot_many
+from core.utils import run_every
 
 
 class NewsWorker:
     def __init__(self) -> None:
+        create_tables()
         self.news_client = NewsClient()
         self.hf_client = HFClient()
 
     def _fetch_news(self):
-        return self.news_client.fetch_recent_news()
-
-    def _summarize(self, headlines):
-        return [self.hf_client.summarize(item["headline"]) for item in headlines]
-
-    def _save_news(self, db: Session, headlines, summaries):
-        for item, summary in zip(headlines, summaries):
-            record = NewsRecord(
-                headline=item["headline"],
-                source=item["source"],
-                published_at=datetime.fromtimestamp(item["timestamp"], tz=timezone.utc),
-                tag=item.get("tag", ""),
-                summary=summary,
-            )
-            db.add(record)
-
-    def run_once(self) -> None:
-        create_tables()
+        return self.news_client.fetch_headlines()
+
+    def _classify(self, articles):
+        return self.hf_client.classify_batch([article["headline"] for article in articles])
+
+    def _save_news(self, db: Session, articles, tags):
+        bulk_write(
+            db,
+            NewsRecord,
+            [
+                {
+                    "headline": article["headline"],
+                    "source": article["source"],
+                    "url": article["url"],
+                    "published_at": article["published_at"],
+                    "tag": tag["label"],
+                    "summary": article["summary"],
+                }
+                for article, tag in zip(articles, tags)
+            ],
+        )
+
+    def run_once(self, context: Dict[str, Any] | None = None) -> None:
         db: Session = SessionLocal()
         try:
-            headlines = self._fetch_news()
-            summaries = self._summarize(headlines)
+            articles = self._fetch_news()
+            tags = self._classify(articles)
 
-            self._save_news(db, headlines, summaries)
+            self._save_news(db, articles, tags)
             db.commit()
 
-            cache_snapshot(
-                "news:latest",
-                [
-                    {
-                        "headline": h["headline"],
-                        "source": h["source"],
-                        "published_at": datetime.fromtimestamp(h["timestamp"], tz=timezone.utc).isoformat(),
-                        "tag": h.get("tag", ""),
-                        "summary": s,
-                    }
-                    for h, s in zip(headlines, summaries)
-                ],
-            )
+            items = [
+                {
+                    "headline": article["headline"],
+                    "source": article["source"],
+                    "published_at": article["published_at"].isoformat(),
+                    "tag": tag["label"],
+                    "summary": article["summary"],
+                }
+                for article, tag in zip(articles, tags)
+            ]
+            # The count rides along so readers that only need it skip fetching the headline list.
+            cache_snapshot_many({"news:latest": items, "news:latest:count": len(items)})
+            if context is not None:
+                context["news_count"] = len(items)
         finally:
             db.close()
 
+    def close(self) -> None:
+        self.news_client.close()
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="News ingestion worker")
@@ -75,12 +85,13 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     worker = NewsWorker()
-    if args.loop:
-        while True:
+    try:
+        if args.loop:
+            run_every(worker.run_once, args.interval)
+        else:
             worker.run_once()
-            time.sleep(args.interval)
-    else:
-        worker.run_once()
+    finally:
+        worker.close()
 
 
 if __name__ == "__main__":
@@ -5,31 +5,60 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
 import argparse
-import subprocess
-import time
-
-WORKERS = [
-    "inflow_worker.py",
-    "state_worker.py",
-    "analytics_worker.py",
-    "geometry_worker.py",
-    "news_worker.py",
-    "swarm_worker.py",
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from core.db import create_tables
+from core.utils import run_every
+from workers.analytics_worker import AnalyticsWorker
+from workers.geometry_worker import GeometryWorker
+from workers.inflow_worker import InflowWorker
+from workers.news_worker import NewsWorker
+from workers.state_worker import StateWorker
+from workers.swarm_worker import SwarmWorker
+
+logger = logging.getLogger(__name__)
+
+# Each stage only reads what earlier stages published, so a cycle sees this cycle's data; workers
+# within a stage are independent and run concurrently.
+STAGES = [
+    [InflowWorker, NewsWorker],
+    [AnalyticsWorker],
+    [StateWorker],
+    [GeometryWorker],
+    [SwarmWorker],
 ]
+WORKERS = [worker_cls for stage in STAGES for worker_cls in stage]
 
 
 class Scheduler:
+    """Runs every worker in-process so the interpreter, imports, DB engine and HTTP pool are shared."""
+
     def __init__(self, interval: int) -> None:
         self.interval = interval
+        create_tables()
+        # Workers are built on first use and kept, so their caches and running stats survive cycles.
+        self._workers: Dict[type, Any] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(map(len, STAGES)), thread_name_prefix="worker")
+
+    def _run_worker(self, worker_cls: type, context: Dict[str, Any]) -> None:
+        try:
+            worker = self._workers.get(worker_cls)
+            if worker is None:
+                worker = self._workers[worker_cls] = worker_cls()
+            worker.run_once(context)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("%s failed", worker_cls.__name__)
 
     def run_once(self) -> None:
-        for worker in WORKERS:
-            subprocess.Popen(["python", f"workers/{worker}"])
+        # Values workers hand to later stages in-process, skipping a Redis round-trip.
+        context: Dict[str, Any] = {}
+        for stage in STAGES:
+            list(self._executor.map(self._run_worker, stage, [context] * len(stage)))
 
     def run_loop(self) -> None:
-        while True:
-            self.run_once()
-            time.sleep(self.interval)
+        run_every(self.run_once, self.interval)
 
 
 def parse_args() -> argparse.Namespace:
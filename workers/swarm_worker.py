@@ -5,12 +5,11 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
 import argparse
-import json
-import time
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Any, Dict, List
 
 import numpy as np
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from core.db import (
@@ -18,75 +17,141 @@ from core.db import (
     MarketStateSnapshot,
     SessionLocal,
     SwarmSnapshotRecord,
+    bulk_write,
     create_tables,
+    unpack_vector,
 )
 from core.redis_client import cache_snapshot
-from core.state_space import MarketState
+from core.state_space import N_FEATURES, MarketState
 from core.swarm import SwarmAgent, SwarmAgentConfig, SwarmEnsemble
+from core.utils import run_every
 
 
 class SwarmWorker:
     def __init__(self) -> None:
-        agent_config = SwarmAgentConfig()
-        self.agents = [SwarmAgent(config=agent_config) for _ in range(3)]
+        create_tables()
+        # One session for the worker's lifetime; it only holds a pooled connection while a tick's
+        # transaction is open, and every read is a Core select, so there is no identity map to expire.
+        self._db: Session = SessionLocal()
+        self.agents = self._bootstrap_agents()
         self.ensemble = SwarmEnsemble(self.agents)
-
-    def _load_state(self, db: Session) -> MarketState | None:
-        row = (
-            db.query(MarketStateSnapshot)
+        # Timestamp of the last state scored and committed; an unchanged watermark skips the tick.
+        self._last_ts: datetime | None = None
+        # Built once and reused every tick; only the columns that get decoded are selected.
+        self._latest_ts_stmt = select(func.max(MarketStateSnapshot.timestamp))
+        self._state_stmt = (
+            select(
+                MarketStateSnapshot.timestamp,
+                MarketStateSnapshot.state_vector,
+                MarketStateSnapshot.composite_axes,
+            )
             .order_by(MarketStateSnapshot.timestamp.desc())
             .limit(1)
-            .first()
         )
+        self._geometry_stmt = (
+            select(
+                GeometrySnapshotRecord.coords,
+                GeometrySnapshotRecord.motif_id,
+                GeometrySnapshotRecord.transition_probs,
+                GeometrySnapshotRecord.local_vector,
+            )
+            .order_by(GeometrySnapshotRecord.timestamp.desc())
+            .limit(1)
+        )
+
+    def _bootstrap_agents(self) -> List[SwarmAgent]:
+        # Hand-tuned specialists, one per horizon, each reading a slice of the normalized state.
+        return [
+            SwarmAgent(
+                SwarmAgentConfig("flow_momentum", ["net_flow", "flow_axis", "pressure_axis"], "1h", "price"),
+                [-0.5, -0.3, 0.4],
+            ),
+            SwarmAgent(
+                SwarmAgentConfig(
+                    "leverage_unwind", ["open_interest", "funding_skew", "perp_basis"], "4h", "price", threshold=0.6
+                ),
+                [-0.3, -0.5, -0.2],
+            ),
+            SwarmAgent(
+                SwarmAgentConfig(
+                    "headline_shock",
+                    ["headline_risk", "headline_recency", "headline_axis"],
+                    "5m",
+                    "event",
+                    threshold=0.4,
+                    direction_labels=("EVENT_YES", "EVENT_NO"),
+                ),
+                [0.6, 0.2, 0.2],
+            ),
+        ]
+
+    def _load_state(self, db: Session) -> MarketState | None:
+        row = db.execute(self._state_stmt).first()
         if row is None:
             return None
+        vector = unpack_vector(row.state_vector)
+        if vector.size != N_FEATURES:
+            # Legacy or differently packed rows would be scored as garbage; skip the tick instead.
+            return None
         try:
-            vector = json.loads(row.state_vector)
             return MarketState(
                 timestamp=row.timestamp,
                 raw_features={},
                 normalized_features={},
-                composite_axes=json.loads(row.composite_axes),
-                vector=np.array(vector),
+                composite_axes=row.composite_axes,
+                vector=vector.astype(np.float64),
             )
         except Exception:
             return None
 
     def _load_geometry(self, db: Session) -> Dict:
-        row = (
-            db.query(GeometrySnapshotRecord)
-            .order_by(GeometrySnapshotRecord.timestamp.desc())
-            .limit(1)
-            .first()
-        )
+        row = db.execute(self._geometry_stmt).first()
         if row is None:
             return {}
         try:
             return {
-                "coords": json.loads(row.coords),
+                "coords": unpack_vector(row.coords).tolist(),
                 "motif_id": row.motif_id,
-                "transition_probs": json.loads(row.transition_probs),
-                "local_vector": json.loads(row.local_vector),
+                "transition_probs": row.transition_probs,
+                "local_vector": unpack_vector(row.local_vector).tolist(),
             }
         except Exception:
             return {}
 
-    def run_once(self) -> None:
-        create_tables()
-        db: Session = SessionLocal()
+    def run_once(self, context: Dict[str, Any] | None = None) -> None:
+        db = self._db
         try:
-            state = self._load_state(db)
+            # A single index lookup decides whether there is anything new to score.
+            latest = db.execute(self._latest_ts_stmt).scalar()
+            state = self._load_state(db) if latest is not None and latest != self._last_ts else None
+            if state is None:
+                # Nothing new to score; end the read transaction rather than hold it open until the next tick.
+                db.rollback()
+                return
             geometry = self._load_geometry(db)
-            snapshot = self.ensemble.evaluate(state, geometry)
-            record = SwarmSnapshotRecord(
-                timestamp=datetime.now(timezone.utc),
-                snapshot=json.dumps(snapshot.to_dict()),
+            snapshot = self.ensemble.predict(state, geometry.get("motif_id"))
+            bulk_write(
+                db,
+                SwarmSnapshotRecord,
+                [
+                    {
+                        "timestamp": datetime.now(timezone.utc),
+                        "motif_id": snapshot.motif_id,
+                        "per_horizon": snapshot.per_horizon,
+                        "agent_breakdown": snapshot.agent_breakdown,
+                    }
+                ],
             )
-            db.add(record)
             db.commit()
+            self._last_ts = state.timestamp
             cache_snapshot("swarm:latest", snapshot.to_dict())
-        finally:
-            db.close()
+        except Exception:
+            # Leave the long-lived session clean for the next tick.
+            db.rollback()
+            raise
+
+    def close(self) -> None:
+        self._db.close()
 
 
 def parse_args() -> argparse.Namespace:
@@ -99,12 +164,13 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     worker = SwarmWorker()
-    if args.loop:
-        while True:
+    try:
+        if args.loop:
+            run_every(worker.run_once, args.interval)
+        else:
             worker.run_once()
-            time.sleep(args.interval)
-    else:
-        worker.run_once()
+    finally:
+        worker.close()
 
 
 if __name__ == "__main__":